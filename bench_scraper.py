@@ -0,0 +1,69 @@
+"""
+    Offline scraper throughput benchmark against the gao_stub stand-in.
+
+    python3 bench_scraper.py --protests 2000 --solicitations 100 --latency 0.05
+"""
+
+import argparse
+import logging
+import time
+
+import gao_stub
+import search
+
+
+def run(args: argparse.Namespace, options: search.RunOptions) -> dict:
+    # Time one process_search run over the synthesized watch list
+    stub = gao_stub.GaoStub(
+        gao_stub.synthesize_protests(args.protests, args.solicitations, args.seed),
+        page_size=args.page_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    rfq_list = ",".join(
+        f"BENCH-{n:04d}:Benchmark RFQ {n}" for n in range(args.solicitations)
+    )
+
+    with gao_stub.GaoStubServer(stub) as server:
+        search.GAO_URL = server.url
+        start = time.perf_counter()
+        items = search.process_search(rfq_list, options)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "backend": options.backend,
+        "concurrency": options.concurrency,
+        "seconds": round(elapsed, 3),
+        "solicitations_per_s": round(args.solicitations / elapsed, 1),
+        "requests": sum(stub.requests.values()),
+        "items": len(items),
+    }
+
+
+""" Run each requested backend and concurrency, one result line each
+"""
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--protests", type=int, default=500)
+    parser.add_argument("--solicitations", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", action="append", choices=["http", "playwright"])
+    parser.add_argument("--concurrency", action="append", type=int)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="0 disables, the stub is local")
+    args = parser.parse_args()
+    for name in ("", "search", "rest"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    for backend in args.backend or ["http"]:
+
+        for concurrency in args.concurrency or [1]:
+            options = search.RunOptions(
+                backend=backend, concurrency=concurrency, rate_limit=args.rate_limit
+            )
+            print(run(args, options))
@@ -0,0 +1,87 @@
+"""
+    Offline startup benchmark: fresh interpreters timed to `import search`,
+    to the first GAO navigation and to the exit of a run with no updates,
+    against the gao_stub stand-in.
+
+    python3 bench_startup.py --runs 10
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import gao_stub
+
+
+HERE = Path(__file__).parent
+
+# Never posted to, a run with no updates exits before the Teams post
+WEBHOOK_URL = "http://127.0.0.1:9/unused"
+
+
+def time_import() -> float:
+    # Seconds from interpreter launch to `import search` returning
+    start = time.time()
+    subprocess.run(
+        [sys.executable, "-c", "import search"], cwd=HERE, check=True, capture_output=True
+    )
+    return time.time() - start
+
+
+def time_run(args: argparse.Namespace) -> tuple[float, float]:
+    # Seconds from interpreter launch to the first navigation and to exit
+    # of a no-updates run
+    stub = gao_stub.GaoStub(latency=args.latency)
+
+    with gao_stub.GaoStubServer(stub) as server:
+        start = time.time()
+        subprocess.run(
+            [
+                sys.executable,
+                "search.py",
+                "NO-UPDATES-0001:Quiet RFQ",
+                WEBHOOK_URL,
+                "--backend",
+                args.backend,
+                "--rate-limit",
+                "0",
+            ],
+            cwd=HERE,
+            env={**os.environ, "GAO_URL": server.url},
+            check=True,
+            capture_output=True,
+        )
+        exited = time.time() - start
+
+    return stub.first_request - start, exited
+
+
+def summary(seconds: list[float]) -> dict:
+    return {
+        "p50": round(statistics.median(seconds), 3),
+        "min": round(min(seconds), 3),
+        "max": round(max(seconds), 3),
+    }
+
+
+""" Time each startup path over several fresh interpreters, one result line each
+"""
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--backend", choices=["http", "playwright"], default="http")
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    logging.getLogger("search").setLevel(logging.WARNING)
+
+    imports = [time_import() for _ in range(args.runs)]
+    runs = [time_run(args) for _ in range(args.runs)]
+
+    print({"stage": "import", **summary(imports)})
+    print({"stage": "first_navigation", **summary([first for first, _ in runs])})
+    print({"stage": "no_updates_exit", **summary([exited for _, exited in runs])})
@@ -0,0 +1,106 @@
+"""
+    Packs formatted TextBlocks into as few MS Teams messages as fit a
+    serialized byte budget, never splitting a solicitation's block
+    across messages.
+"""
+
+import logging
+
+
+log = logging.getLogger("search")
+
+# Serialized message bytes, under the ~28 KB Teams webhooks accept
+MAX_BYTES = 27_000
+
+
+def message_body(items: list[dict]) -> dict:
+    # Teams message with one AdaptiveCard holding items
+    return {
+        "type": "message",
+        "attachments": [
+            {
+                "contentType": "application/vnd.microsoft.card.adaptive",
+                "content": {
+                    "type": "AdaptiveCard",
+                    "version": "1.0",
+                    "body": [{"type": "Container", "items": items}],
+                    "msteams": {"width": "Full"},
+                },
+            }
+        ],
+    }
+
+
+def size(value, encode=None) -> int:
+    # Serialized bytes as sent, encode being the ApiClient's encode_json,
+    # or the REST client's default compact encoding
+    if encode is None:
+        from client.rest import compact_json as encode
+
+    return len(encode(value))
+
+
+def separator_size(encode=None) -> int:
+    # Bytes encode puts between list items
+    return size([0, 0], encode) - size([0], encode) - size(0, encode)
+
+
+def part_header(n: int, count: int) -> dict:
+    return {"type": "TextBlock", "text": f"**Part {n} of {count}.**", "wrap": True}
+
+
+def blocks(items: list[dict]) -> list[list[dict]]:
+    # Group items into blocks kept together, each ending with its spacer
+    grouped = []
+    current = []
+
+    for item in items:
+        current.append(item)
+
+        if item.get("text") == "":
+            grouped.append(current)
+            current = []
+
+    if current:
+        grouped.append(current)
+
+    return grouped
+
+
+def pack(items: list[dict], max_bytes: int = MAX_BYTES, encode=None) -> list[list[dict]]:
+    # Split items into message bodies in order, each with a numbered
+    # header when there is more than one; filling each message before
+    # starting the next gives the fewest messages for an ordered list.
+    # Sizes are measured with encode, as in size()
+    if size(message_body(items), encode) <= max_bytes:
+        return [items]
+
+    separator_bytes = separator_size(encode)
+
+    # Room for the widest header a run will need
+    empty_bytes = size(message_body([]), encode) + size(part_header(999, 999), encode)
+    messages = []
+    current = []
+    used = empty_bytes
+
+    for block in blocks(items):
+        block_bytes = sum(size(item, encode) + separator_bytes for item in block)
+
+        if current and used + block_bytes > max_bytes:
+            messages.append(current)
+            current = []
+            used = empty_bytes
+
+        if used + block_bytes > max_bytes:
+            log.warning(f"Block of {block_bytes} bytes exceeds the {max_bytes} byte budget, posting it alone")
+
+        current += block
+        used += block_bytes
+
+    if current:
+        messages.append(current)
+
+    return [
+        [part_header(n, len(messages))] + message
+        for n, message in enumerate(messages, 1)
+    ]
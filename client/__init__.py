@@ -1,6 +1,31 @@
 from __future__ import absolute_import
 
-from client.api.ms_api import MsApi
-from client.api_client import ApiClient
-from client.configuration import Configuration
-from client.models.ms_channel_dto import MsChannelDto
+import importlib
+
+# Public names, imported on first access so that importing client.timing
+# or a no-update run does not load the REST stack, nor aiohttp unless the
+# async client is used
+_LAZY = {
+    "MsApi": "client.api.ms_api",
+    "AsyncMsApi": "client.api.async_ms_api",
+    "ApiClient": "client.api_client",
+    "AsyncApiClient": "client.async_api_client",
+    "Configuration": "client.configuration",
+    "MsChannelDto": "client.models.ms_channel_dto",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    # Cached, later lookups and mock patches see a plain attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
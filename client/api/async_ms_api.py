@@ -0,0 +1,37 @@
+from __future__ import absolute_import
+
+from client.api.ms_api import MsApi
+from client.async_api_client import AsyncApiClient
+
+
+class AsyncMsApi(MsApi):
+
+    def __init__(self, api_client=None):
+
+        if api_client is None:
+            api_client = AsyncApiClient()
+
+        self.api_client = api_client
+
+    async def teams_post(self, **kwargs):
+        """Posts data to Teams channel without blocking the event loop.
+
+        >>> async with AsyncApiClient(configuration) as api_client:
+        ...     result = await AsyncMsApi(api_client).teams_post(body=body)
+
+        :param str body
+        :param _request_timeout: total seconds, or a (connection, read) pair
+        :return: MsChannelDto
+        """
+        kwargs['_return_http_data_only'] = True
+        return await self.teams_post_with_http_info(**kwargs)
+
+    async def teams_post_with_http_info(self, **kwargs):
+        """Posts data to Teams channel without blocking the event loop.
+
+        :param str body
+        :param _request_timeout: total seconds, or a (connection, read) pair
+        :return: MsChannelDto, with the status code and headers unless
+            _return_http_data_only is set
+        """
+        return await super(AsyncMsApi, self).teams_post_with_http_info(**kwargs)
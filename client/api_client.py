@@ -3,7 +3,6 @@ from __future__ import absolute_import
 import datetime
 import json
 import mimetypes
-from multiprocessing.pool import ThreadPool
 import os
 import re
 import tempfile
@@ -14,6 +13,7 @@ from six.moves.urllib.parse import quote
 from client.configuration import Configuration
 import client.models
 from client import rest
+from client import timing
 
 
 class ApiClient(object):
@@ -44,7 +44,7 @@ class ApiClient(object):
             configuration = Configuration()
         
         self.configuration = configuration
-        self.pool = ThreadPool()
+        self._pool = None
         self.rest_client = rest.RESTClientObject(configuration)
         self.default_headers = {}
 
@@ -55,8 +55,18 @@ class ApiClient(object):
         self.user_agent = 'Swagger-Codegen/1.0.0/python'
 
     def __del__(self):
-        self.pool.close()
-        self.pool.join()
+        if getattr(self, '_pool', None) is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    @property
+    def pool(self):
+        """Thread pool for async_req calls, created on first use"""
+        if self._pool is None:
+            from multiprocessing.pool import ThreadPool
+            self._pool = ThreadPool()
+        return self._pool
 
     @property
     def user_agent(self):
@@ -77,6 +87,29 @@ class ApiClient(object):
             _return_http_data_only=None, collection_formats=None,
             _preload_content=True, _request_timeout=None):
 
+        url, header_params, query_params, post_params, body = \
+            self._prepare_request(
+                resource_path, path_params, query_params, header_params,
+                body, post_params, files, auth_settings, collection_formats)
+
+        # perform request and return response
+        with timing.span("http_request", method=method):
+            response_data = self.request(
+                method, url, query_params=query_params, headers=header_params,
+                post_params=post_params, body=body,
+                _preload_content=_preload_content,
+                _request_timeout=_request_timeout)
+
+        return self._handle_response(response_data, response_type,
+                                     _preload_content, _return_http_data_only)
+
+    def _prepare_request(
+            self, resource_path, path_params, query_params, header_params,
+            body, post_params, files, auth_settings, collection_formats):
+        """Builds the url, headers, parameters and body of a request.
+
+        :return: tuple (url, header_params, query_params, post_params, body)
+        """
         config = self.configuration
 
         # header parameters
@@ -118,25 +151,29 @@ class ApiClient(object):
 
         # body
         if body:
-            body = self.sanitize_for_serialization(body)
+            with timing.span("serialize"):
+                if (isinstance(body, (dict, list)) and rest.is_json_content_type(
+                        header_params.get('Content-Type', 'application/json'))):
+                    body = self.encode_json(body)
+                else:
+                    body = self.sanitize_for_serialization(body)
 
         # request url
         url = self.configuration.host + resource_path
-        
-        # perform request and return response
-        response_data = self.request(
-            method, url, query_params=query_params, headers=header_params,
-            post_params=post_params, body=body,
-            _preload_content=_preload_content,
-            _request_timeout=_request_timeout)
-        
+
+        return url, header_params, query_params, post_params, body
+
+    def _handle_response(self, response_data, response_type,
+                         _preload_content, _return_http_data_only):
+        """Deserializes a response as call_api returns it."""
         self.last_response = response_data
 
         return_data = response_data
         if _preload_content:
             # deserialize response data
             if response_type:
-                return_data = self.deserialize(response_data, response_type)
+                with timing.span("deserialize"):
+                    return_data = self.deserialize(response_data, response_type)
             else:
                 return_data = None
 
@@ -188,6 +225,27 @@ class ApiClient(object):
         return {key: self.sanitize_for_serialization(val)
                 for key, val in six.iteritems(obj_dict)}
 
+    def encode_json(self, obj):
+        """Encodes a plain dict or list body to JSON bytes.
+
+        The body is not walked beforehand, models, dates and datetimes
+        nested in it are converted by the encoder's default hook. Uses
+        configuration.json_encoder when set.
+
+        :param obj: The body to encode.
+        :return: The encoded body as bytes.
+        """
+        encoder = self.configuration.json_encoder or rest.compact_json
+        return encoder(obj, default=self._json_default)
+
+    def _json_default(self, obj):
+        if isinstance(obj, (datetime.datetime, datetime.date)):
+            return obj.isoformat()
+        if hasattr(obj, 'attribute_map'):
+            return self.sanitize_for_serialization(obj)
+        raise TypeError('Object of type %s is not JSON serializable'
+                        % type(obj).__name__)
+
     def deserialize(self, response, response_type):
         """Deserializes response into an object.
 
@@ -277,9 +335,9 @@ class ApiClient(object):
                                        and headers
         :param collection_formats: dict of collection formats for path, query,
             header, and post parameters.
-        :param _preload_content: if False, the urllib3.HTTPResponse object will
-                                 be returned without reading/decoding response
-                                 data. Default is True.
+        :param _preload_content: if False, a rest.StreamingResponse is returned
+                                 without reading the response body.
+                                 Default is True.
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -0,0 +1,105 @@
+from __future__ import absolute_import
+
+from client.api_client import ApiClient
+from client.configuration import Configuration
+from client import async_rest
+from client import timing
+
+
+class AsyncApiClient(ApiClient):
+    """Asyncio API client on a non-blocking aiohttp connection pool.
+
+    Mirrors ApiClient, but call_api is a coroutine: requests overlap with
+    other tasks on the event loop, wait for a free pooled connection when
+    connection_pool_maxsize are in flight, and are cancelled with the
+    task awaiting them. Use as an async context manager, or await
+    close(), to release the pool.
+
+    :param configuration: .Configuration object for this client
+    :param header_name: a header to pass when making calls to the API.
+    :param header_value: a header value to pass when making calls to
+        the API.
+    :param cookie: a cookie to include in the header when making calls
+        to the API
+    """
+
+    def __init__(self, configuration=None, header_name=None,
+                 header_value=None, cookie=None):
+
+        if configuration is None:
+            configuration = Configuration()
+
+        self.configuration = configuration
+        self._pool = None
+        self.rest_client = async_rest.RESTClientObject(configuration)
+        self.default_headers = {}
+
+        if header_name is not None:
+            self.default_headers[header_name] = header_value
+
+        self.cookie = cookie
+        self.user_agent = 'Swagger-Codegen/1.0.0/python'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        await self.rest_client.close()
+
+    async def call_api(self, resource_path, method,
+                       path_params=None, query_params=None, header_params=None,
+                       body=None, post_params=None, files=None,
+                       response_type=None, auth_settings=None, async_req=None,
+                       _return_http_data_only=None, collection_formats=None,
+                       _preload_content=True, _request_timeout=None):
+        """Makes the HTTP request and returns deserialized data.
+
+        :param resource_path: Path to method endpoint.
+        :param method: Method to call.
+        :param path_params: Path parameters in the url.
+        :param query_params: Query parameters in the url.
+        :param header_params: Header parameters to be
+            placed in the request header.
+        :param body: Request body.
+        :param post_params dict: Request post form parameters,
+            for `application/x-www-form-urlencoded`, `multipart/form-data`.
+        :param auth_settings list: Auth Settings names for the request.
+        :param response_type: Response data type.
+        :param files dict: key -> filename, value -> filepath,
+            for `multipart/form-data`.
+        :param async_req: not supported, await the call instead.
+        :param _return_http_data_only: response data without head status code
+                                       and headers
+        :param collection_formats: dict of collection formats for path, query,
+            header, and post parameters.
+        :param _preload_content: if False, the aiohttp.ClientResponse object
+                                 will be returned without reading the
+                                 response body. Default is True.
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :return: The response data, or a tuple of it with the status code
+            and headers, when awaited.
+        """
+        if async_req:
+            raise ValueError("async_req is not supported, await the call")
+
+        url, header_params, query_params, post_params, body = \
+            self._prepare_request(
+                resource_path, path_params, query_params, header_params,
+                body, post_params, files, auth_settings, collection_formats)
+
+        # perform request and return response
+        with timing.span("http_request", method=method):
+            response_data = await self.rest_client.request(
+                method, url, query_params=query_params, headers=header_params,
+                post_params=post_params, body=body,
+                _preload_content=_preload_content,
+                _request_timeout=_request_timeout)
+
+        return self._handle_response(response_data, response_type,
+                                     _preload_content, _return_http_data_only)
@@ -0,0 +1,188 @@
+from __future__ import absolute_import
+
+import io
+import json
+import logging
+
+from six.moves.urllib.parse import urlencode
+
+try:
+    import aiohttp
+except ImportError:
+    raise ImportError('The asyncio client requires aiohttp.')
+
+from client import pools
+from client.rest import ApiException, is_json_content_type
+
+
+logger = logging.getLogger("rest")
+
+# Seconds allowed for a request when no _request_timeout is given
+DEFAULT_TIMEOUT = 5 * 60
+
+
+class RESTResponse(io.IOBase):
+
+    def __init__(self, resp, data):
+        self.aiohttp_response = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self.data = data
+
+    def getheaders(self):
+        """Returns a CIMultiDictProxy of the response headers."""
+        return self.aiohttp_response.headers
+
+    def getheader(self, name, default=None):
+        """Returns a given response header."""
+        return self.aiohttp_response.headers.get(name, default)
+
+
+class RESTClientObject(object):
+    """Non-blocking REST client on an aiohttp connection pool.
+
+    The session is opened on the first request, inside the running event
+    loop, and holds at most maxsize connections; further requests wait for
+    a free connection. Close it with `await close()`.
+    """
+
+    def __init__(self, configuration, pools_size=4, maxsize=None):
+        # maxsize is the number of requests to host that are allowed in parallel
+        if maxsize is None:
+            maxsize = pools.pool_maxsize(configuration)
+
+        # Shared with the sync clients, CA certs are loaded once per process
+        ssl_context = pools.registry.ssl_context(configuration)
+
+        self.maxsize = maxsize
+        self.ssl_context = ssl_context
+        self.proxy = configuration.proxy
+        self._session = None
+
+    @property
+    def session(self):
+        """The aiohttp session, opened on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.maxsize,
+                                             ssl=self.ssl_context)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def request(self, method, url, query_params=None, headers=None,
+                      body=None, post_params=None, _preload_content=True,
+                      _request_timeout=None):
+        """Perform requests.
+
+        :param method: http request method
+        :param url: http request url
+        :param query_params: query parameters in the url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencoded`
+                            and `multipart/form-data`
+        :param _preload_content: if False, the aiohttp.ClientResponse object
+                                 will be returned without reading the
+                                 response body. Default is True.
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        """
+        method = method.upper()
+        assert method in ['GET', 'HEAD', 'DELETE', 'POST', 'PUT',
+                          'PATCH', 'OPTIONS']
+
+        if post_params and body:
+            raise ValueError(
+                "body parameter cannot be used with post_params parameter."
+            )
+
+        post_params = post_params or {}
+        headers = headers or {}
+
+        if isinstance(_request_timeout, tuple) and len(_request_timeout) == 2:
+            timeout = aiohttp.ClientTimeout(sock_connect=_request_timeout[0],
+                                            sock_read=_request_timeout[1])
+        else:
+            timeout = aiohttp.ClientTimeout(
+                total=_request_timeout or DEFAULT_TIMEOUT)
+
+        # Body-less `GET` and `HEAD` requests are sent without a Content-Type
+        if method not in ['GET', 'HEAD'] and 'Content-Type' not in headers:
+            headers['Content-Type'] = 'application/json'
+
+        args = {
+            "method": method,
+            "url": url,
+            "timeout": timeout,
+            "headers": headers
+        }
+
+        if self.proxy:
+            args["proxy"] = self.proxy
+
+        if query_params:
+            args["url"] += '?' + urlencode(query_params)
+
+        # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            if is_json_content_type(headers['Content-Type']):
+                if isinstance(body, bytes):
+                    # Already encoded by ApiClient.encode_json
+                    args["data"] = body
+                elif body is not None:
+                    args["data"] = json.dumps(body)
+            elif headers['Content-Type'] == 'application/x-www-form-urlencoded':
+                args["data"] = aiohttp.FormData(post_params)
+            elif headers['Content-Type'] == 'multipart/form-data':
+                # must del headers['Content-Type'], or the correct
+                # Content-Type which generated by aiohttp will be
+                # overwritten.
+                del headers['Content-Type']
+                data = aiohttp.FormData()
+                for k, v in post_params:
+                    if isinstance(v, tuple) and len(v) == 3:
+                        data.add_field(k, value=v[1], filename=v[0],
+                                       content_type=v[2])
+                    else:
+                        data.add_field(k, v)
+                args["data"] = data
+            # Pass a `string` parameter directly in the body to support
+            # other content types than Json when `body` argument is provided
+            # in serialized form
+            elif isinstance(body, str):
+                args["data"] = body
+            else:
+                # Cannot generate the request from given parameters
+                msg = """Cannot prepare a request message for provided
+                         arguments. Please check that your arguments match
+                         declared content type."""
+                raise ApiException(status=0, reason=msg)
+
+        logger.info(f'{method}')
+
+        try:
+            r = await self.session.request(**args)
+        except aiohttp.ClientSSLError as e:
+            msg = "{0}\n{1}".format(type(e).__name__, str(e))
+            raise ApiException(status=0, reason=msg)
+
+        if _preload_content:
+            data = await r.read()
+            r = RESTResponse(r, data)
+
+            # log response body
+            logger.debug("response body: %s", r.data)
+
+        if not 200 <= r.status <= 299:
+            if not _preload_content:
+                r = RESTResponse(r, await r.read())
+            raise ApiException(http_resp=r)
+
+        return r
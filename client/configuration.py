@@ -3,7 +3,6 @@ from __future__ import absolute_import
 
 import copy
 import logging
-import multiprocessing
 import sys
 import urllib3
 
@@ -76,16 +75,18 @@ class Configuration(six.with_metaclass(TypeWithDefault, object)):
         self.assert_hostname = None
 
         # urllib3 connection pool's maximum number of connections saved
-        # per pool. urllib3 uses 1 connection as default value, but this is
-        # not the best value when you are making a lot of possibly parallel
-        # requests to the same host, which is often the case here.
-        # cpu_count * 5 is used as default value to increase performance.
-        self.connection_pool_maxsize = multiprocessing.cpu_count() * 5
+        # per pool. Set it to the number of requests made in parallel to a
+        # host; None keeps client.pools' small default, rather than
+        # holding cpu_count * 5 idle connections per host in the shared pool.
+        self.connection_pool_maxsize = None
 
         # Proxy URL
         self.proxy = None
         # Safe chars for path_param
         self.safe_chars_for_path_param = ''
+        # JSON body encoder, called as encoder(obj, default=hook) and
+        # returning bytes, e.g. orjson.dumps. None uses rest.compact_json.
+        self.json_encoder = None
 
     @property
     def logger_file(self):
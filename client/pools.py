@@ -0,0 +1,198 @@
+from __future__ import absolute_import
+
+import logging
+import ssl
+import threading
+
+
+logger = logging.getLogger("rest")
+
+# Hosts a shared pool manager keeps connection pools for: GAO, the
+# webhook host and a few spare
+NUM_POOLS = 10
+
+
+class PoolRegistry(object):
+    """Process-wide urllib3 pool managers shared by every REST client.
+
+    Clients whose configurations have the same TLS, proxy and pool size
+    settings get the same manager, and so share its per-host keep-alive
+    connection pools and one SSLContext, with the CA bundle loaded once.
+    Lookups count as hits or misses, and per-host stats report how many
+    requests reused a kept-alive connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._managers = {}
+        self._contexts = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(configuration, maxsize):
+        return (configuration.verify_ssl, configuration.ssl_ca_cert,
+                configuration.cert_file, configuration.key_file,
+                configuration.assert_hostname, configuration.proxy, maxsize)
+
+    def ssl_context(self, configuration):
+        """Returns the shared SSLContext for a configuration's TLS settings.
+
+        :param configuration: .Configuration of the client.
+        """
+        key = (configuration.verify_ssl, configuration.ssl_ca_cert,
+               configuration.cert_file, configuration.key_file)
+
+        with self._lock:
+            context = self._contexts.get(key)
+
+            if context is None:
+                import certifi
+
+                context = ssl.create_default_context(
+                    cafile=configuration.ssl_ca_cert or certifi.where())
+                if configuration.cert_file:
+                    context.load_cert_chain(configuration.cert_file,
+                                            keyfile=configuration.key_file)
+                if not configuration.verify_ssl:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                self._contexts[key] = context
+
+            return context
+
+    def manager(self, configuration, maxsize):
+        """Returns the shared pool manager for a configuration.
+
+        :param configuration: .Configuration of the client.
+        :param maxsize: connections kept alive per host.
+        """
+        import urllib3
+
+        key = self._key(configuration, maxsize)
+        context = self.ssl_context(configuration)
+
+        with self._lock:
+            manager = self._managers.get(key)
+
+            if manager is not None:
+                self.hits += 1
+                return manager
+
+            self.misses += 1
+
+            addition_pool_args = {
+                'cert_reqs': (ssl.CERT_REQUIRED if configuration.verify_ssl
+                              else ssl.CERT_NONE),
+            }
+            if configuration.assert_hostname is not None:
+                addition_pool_args['assert_hostname'] = \
+                    configuration.assert_hostname
+
+            # CA certs and client certs are loaded in the shared context,
+            # not again for every connection
+            if configuration.proxy:
+                manager = urllib3.ProxyManager(
+                    num_pools=NUM_POOLS,
+                    maxsize=maxsize,
+                    ssl_context=context,
+                    proxy_url=configuration.proxy,
+                    **addition_pool_args
+                )
+            else:
+                manager = urllib3.PoolManager(
+                    num_pools=NUM_POOLS,
+                    maxsize=maxsize,
+                    ssl_context=context,
+                    **addition_pool_args
+                )
+
+            self._managers[key] = manager
+            return manager
+
+    def warmup(self, configuration, url, maxsize=None):
+        """Opens a kept-alive connection to url's host in the background.
+
+        A HEAD request to the origin of url opens it, so the TCP and TLS
+        handshakes overlap with other work and the first real request to
+        the host reuses the connection. Only the origin is requested and
+        only the host logged, url may carry a secret such as a webhook
+        key. Failures are logged and otherwise ignored.
+
+        :param configuration: .Configuration of the client that will
+            make the request.
+        :param url: any url on the host, e.g. the webhook url.
+        :param maxsize: as passed to RESTClientObject, if not the default.
+        :return: the started daemon thread.
+        """
+        import urllib3
+
+        if maxsize is None:
+            maxsize = pool_maxsize(configuration)
+        manager = self.manager(configuration, maxsize)
+        parsed = urllib3.util.parse_url(url)
+        origin = urllib3.util.Url(scheme=parsed.scheme, host=parsed.host,
+                                  port=parsed.port, path='/').url
+
+        def connect():
+            # A body-less HEAD request through the public API, whatever
+            # its status the connection is released back to the pool
+            try:
+                r = manager.request('HEAD', origin, retries=False,
+                                    redirect=False)
+                logger.info("Warmed up connection to %s (HTTP %s)",
+                            parsed.host, r.status)
+            except Exception as e:
+                logger.info("Connection warmup to %s failed: %s",
+                            parsed.host, type(e).__name__)
+
+        thread = threading.Thread(target=connect, daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        """Returns manager lookups and per-host connection reuse.
+
+        :return: dict with manager hits and misses, and for each host the
+            requests made, connections opened and the requests beyond
+            those, served over kept-alive connections.
+        """
+        with self._lock:
+            managers = list(self._managers.values())
+            stats = {"hits": self.hits, "misses": self.misses, "hosts": {}}
+
+        for manager in managers:
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                host = "%s://%s:%s" % (pool.scheme, pool.host, pool.port)
+                host_stats = stats["hosts"].setdefault(
+                    host, {"requests": 0, "connections": 0, "reused": 0})
+                host_stats["requests"] += pool.num_requests
+                host_stats["connections"] += pool.num_connections
+                host_stats["reused"] += max(
+                    pool.num_requests - pool.num_connections, 0)
+
+        return stats
+
+    def clear(self):
+        """Closes every shared connection and resets the stats."""
+        with self._lock:
+            managers = list(self._managers.values())
+            self._managers = {}
+            self.hits = 0
+            self.misses = 0
+
+        for manager in managers:
+            manager.clear()
+
+
+def pool_maxsize(configuration):
+    """Connections kept alive per host for a configuration."""
+    if configuration.connection_pool_maxsize is not None:
+        return configuration.connection_pool_maxsize
+    return 4
+
+
+registry = PoolRegistry()
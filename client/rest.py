@@ -1,13 +1,14 @@
 
 from __future__ import absolute_import
 
+import functools
 import io
 import json
 import logging
+import os
 import re
-import ssl
+import tempfile
 
-import certifi
 import six
 from six.moves.urllib.parse import urlencode
 
@@ -16,11 +17,33 @@ try:
 except ImportError:
     raise ImportError('Python client requires urllib3.')
 
+from client import pools
+
 
 logger = logging.getLogger("rest")
 logger.setLevel(logging.INFO)
 
 
+@functools.lru_cache(maxsize=64)
+def is_json_content_type(content_type):
+    """Whether a Content-Type header value is a JSON media type.
+
+    Cached, a client sends the same few header values on every request.
+    """
+    return re.search('json', content_type, re.IGNORECASE) is not None
+
+
+def compact_json(obj, default=None):
+    """Encodes obj as compact UTF-8 JSON bytes.
+
+    :param obj: JSON-compatible body.
+    :param default: called for values json cannot encode natively.
+    :return: bytes, without whitespace between tokens.
+    """
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                      default=default).encode('utf-8')
+
+
 class RESTResponse(io.IOBase):
 
     def __init__(self, resp):
@@ -38,60 +61,110 @@ class RESTResponse(io.IOBase):
         return self.urllib3_response.getheader(name, default)
 
 
-class RESTClientObject(object):
+class StreamingResponse(RESTResponse):
+    """Response whose body is read from the connection on demand.
 
-    def __init__(self, configuration, pools_size=4, maxsize=None):
-        # urllib3.PoolManager will pass all kw parameters to connectionpool
-        # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/poolmanager.py#L75
-        # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/connectionpool.py#L680
-        # maxsize is the number of requests to host that are allowed in parallel
-        # Custom SSL certificates and client certificates: http://urllib3.readthedocs.io/en/latest/advanced-usage.html
+    Returned for `_preload_content=False`. Read the body once, as chunks,
+    through the file-like read/readinto methods or with stream_to();
+    `data` reads whatever is left into memory. Other attributes, e.g.
+    `stream()` or `release_conn()`, are those of the urllib3 response.
+    """
 
-        # cert_reqs
-        if configuration.verify_ssl:
-            cert_reqs = ssl.CERT_REQUIRED
-        else:
-            cert_reqs = ssl.CERT_NONE
+    # Bytes read per chunk
+    CHUNK_SIZE = 64 * 1024
 
-        # ca_certs
-        if configuration.ssl_ca_cert:
-            ca_certs = configuration.ssl_ca_cert
-        else:
-            # if not set certificate file, use Mozilla's root certificates.
-            ca_certs = certifi.where()
+    def __init__(self, resp):
+        self.urllib3_response = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self._data = None
+
+    def __getattr__(self, name):
+        if name == 'urllib3_response':
+            raise AttributeError(name)
+        return getattr(self.urllib3_response, name)
+
+    @property
+    def data(self):
+        """The rest of the body, read into memory on first access."""
+        if self._data is None:
+            self._data = self.urllib3_response.read()
+        return self._data
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        """Reads body bytes into a writable buffer, 0 at the end."""
+        return self.urllib3_response.readinto(b)
+
+    def read(self, size=-1):
+        return self.urllib3_response.read(None if size < 0 else size)
+
+    def iter_chunks(self, chunk_size=None):
+        """Yields the body as memoryview chunks of one reused buffer.
 
-        addition_pool_args = {}
-        if configuration.assert_hostname is not None:
-            addition_pool_args['assert_hostname'] = configuration.assert_hostname
+        Each chunk is only valid until the next one is read; copy it with
+        bytes(chunk) to keep it.
 
+        :param chunk_size: buffer size, CHUNK_SIZE by default.
+        """
+        buffer = bytearray(chunk_size or self.CHUNK_SIZE)
+        view = memoryview(buffer)
+
+        try:
+            while True:
+                n = self.urllib3_response.readinto(buffer)
+                if not n:
+                    break
+                yield view[:n]
+        finally:
+            view.release()
+
+    def stream_to(self, path, chunk_size=None):
+        """Writes the body to a file, one chunk in memory at a time.
+
+        The file is written next to path and renamed into place once
+        complete, so a failed download leaves no partial file.
+
+        :param path: destination file path.
+        :param chunk_size: buffer size, CHUNK_SIZE by default.
+        :return: bytes written.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+        written = 0
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in self.iter_chunks(chunk_size):
+                    written += f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        finally:
+            self.urllib3_response.release_conn()
+
+        return written
+
+    def close(self):
+        self.urllib3_response.release_conn()
+        super(StreamingResponse, self).close()
+
+
+class RESTClientObject(object):
+
+    def __init__(self, configuration, pools_size=None, maxsize=None):
+        # maxsize is the number of requests to host that are allowed in parallel
+        # The pool manager is shared process-wide through client.pools, keyed
+        # by TLS, proxy and maxsize settings, with one pool per host. pools_size
+        # is kept for compatibility, the shared manager sizes its own.
+        # Custom SSL certificates and client certificates: http://urllib3.readthedocs.io/en/latest/advanced-usage.html
         if maxsize is None:
-            if configuration.connection_pool_maxsize is not None:
-                maxsize = configuration.connection_pool_maxsize
-            else:
-                maxsize = 4
-
-        # https pool manager
-        if configuration.proxy:
-            self.pool_manager = urllib3.ProxyManager(
-                num_pools=pools_size,
-                maxsize=maxsize,
-                cert_reqs=cert_reqs,
-                ca_certs=ca_certs,
-                cert_file=configuration.cert_file,
-                key_file=configuration.key_file,
-                proxy_url=configuration.proxy,
-                **addition_pool_args
-            )
-        else:
-            self.pool_manager = urllib3.PoolManager(
-                num_pools=pools_size,
-                maxsize=maxsize,
-                cert_reqs=cert_reqs,
-                ca_certs=ca_certs,
-                cert_file=configuration.cert_file,
-                key_file=configuration.key_file,
-                **addition_pool_args
-            )
+            maxsize = pools.pool_maxsize(configuration)
+
+        self.pool_manager = pools.registry.manager(configuration, maxsize)
 
     def request(self, method, url, query_params=None, headers=None,
                 body=None, post_params=None, _preload_content=True,
@@ -106,9 +179,9 @@ class RESTClientObject(object):
         :param post_params: request post parameters,
                             `application/x-www-form-urlencoded`
                             and `multipart/form-data`
-        :param _preload_content: if False, the urllib3.HTTPResponse object will
-                                 be returned without reading/decoding response
-                                 data. Default is True.
+        :param _preload_content: if False, a StreamingResponse is returned
+                                 without reading the response body.
+                                 Default is True.
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -135,7 +208,8 @@ class RESTClientObject(object):
                 timeout = urllib3.Timeout(
                     connect=_request_timeout[0], read=_request_timeout[1])
 
-        if 'Content-Type' not in headers:
+        # Body-less `GET` and `HEAD` requests are sent without a Content-Type
+        if method not in ['GET', 'HEAD'] and 'Content-Type' not in headers:
             headers['Content-Type'] = 'application/json'
 
         try:
@@ -143,9 +217,12 @@ class RESTClientObject(object):
             if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
                 if query_params:
                     url += '?' + urlencode(query_params)
-                if re.search('json', headers['Content-Type'], re.IGNORECASE):
+                if is_json_content_type(headers['Content-Type']):
                     request_body = '{}'
-                    if body is not None:
+                    if isinstance(body, bytes):
+                        # Already encoded by ApiClient.encode_json
+                        request_body = body
+                    elif body is not None:
                         request_body = json.dumps(body)
                     logger.info(f'{method}')
                     r = self.pool_manager.request(
@@ -213,6 +290,8 @@ class RESTClientObject(object):
 
             # log response body
             logger.debug("response body: %s", r.data)
+        else:
+            r = StreamingResponse(r)
 
         if not 200 <= r.status <= 299:
             raise ApiException(http_resp=r)
@@ -291,14 +370,25 @@ class ApiException(Exception):
         if http_resp:
             self.status = http_resp.status
             self.reason = http_resp.reason
+            # The response's own bytes, not a copy; a streamed error body
+            # is read here so its connection goes back to the pool
             self.body = http_resp.data
             self.headers = http_resp.getheaders()
+            if isinstance(http_resp, StreamingResponse):
+                http_resp.release_conn()
         else:
             self.status = status
             self.reason = reason
             self.body = None
             self.headers = None
 
+    def __reduce__(self):
+        # Rebuilt from its fields, e.g. when returned by a worker process
+        return self.__class__, (self.status, self.reason), {
+            'body': self.body,
+            'headers': self.headers,
+        }
+
     def __str__(self):
         """Custom error messages for exception"""
         error_message = "({0})\n"\
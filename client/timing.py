@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+
+import contextvars
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+_labels = contextvars.ContextVar("timing_labels", default={})
+
+
+def percentile(durations, pct):
+    """Nearest-rank percentile of a sorted list of durations."""
+    if not durations:
+        return 0.0
+
+    rank = max(int(math.ceil(pct / 100.0 * len(durations))) - 1, 0)
+    return durations[min(rank, len(durations) - 1)]
+
+
+class Recorder(object):
+    """Collects per-stage span durations for a run.
+
+    Spans carry their own labels plus any set with `labels()` in the
+    calling context, so nested stages are attributed to the enclosing
+    rfq or protest, including across asyncio tasks and worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = []
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Times the enclosed block as one `stage` span.
+
+        :param stage: stage name, e.g. navigate or teams_post.
+        :param labels: extra labels recorded with the span.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            record = dict(_labels.get(), **labels)
+            record["stage"] = stage
+            record["seconds"] = duration
+            with self._lock:
+                self.spans.append(record)
+
+    def summary(self):
+        """Returns count, total, p50, p95 and max seconds per stage."""
+        with self._lock:
+            spans = list(self.spans)
+
+        stages = {}
+        for record in spans:
+            stages.setdefault(record["stage"], []).append(record["seconds"])
+
+        summary = {}
+        for stage, durations in sorted(stages.items()):
+            durations.sort()
+            summary[stage] = {
+                "count": len(durations),
+                "total": round(sum(durations), 6),
+                "p50": round(percentile(durations, 50), 6),
+                "p95": round(percentile(durations, 95), 6),
+                "max": round(durations[-1], 6),
+            }
+
+        return summary
+
+    def write_report(self, path, **meta):
+        """Writes the JSON run report: metadata, stage summary and spans.
+
+        :param path: report file path.
+        :param meta: run metadata added to the report.
+        """
+        with self._lock:
+            spans = [dict(record, seconds=round(record["seconds"], 6))
+                     for record in self.spans]
+
+        report = dict(meta, stages=self.summary(), spans=spans)
+
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    def extend(self, spans):
+        """Adds spans recorded elsewhere, e.g. by a worker process."""
+        with self._lock:
+            self.spans.extend(spans)
+
+    def reset(self):
+        with self._lock:
+            self.spans = []
+
+
+recorder = Recorder()
+
+
+def span(stage, **labels):
+    """Times a stage on the process-wide recorder."""
+    return recorder.span(stage, **labels)
+
+
+@contextmanager
+def labels(**values):
+    """Attributes spans recorded in the enclosed block to `values`."""
+    token = _labels.set(dict(_labels.get(), **values))
+    try:
+        yield
+    finally:
+        _labels.reset(token)
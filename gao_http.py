@@ -0,0 +1,359 @@
+"""
+    Browserless GAO backend: fetch server-rendered search and details
+    pages over the client urllib3 pool and read them with html.parser.
+"""
+
+import logging
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import client
+import throttle
+from client import timing
+
+
+log = logging.getLogger("search")
+
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'Cache-Control': 'no-cache',
+}
+
+# Markers of bot protection interstitials served with a 200
+CHALLENGE_MARKERS = (
+    "challenge-platform",
+    "cf-chl-",
+    "_incapsula_resource",
+    "bm-verify",
+    "sec-if-cpt",
+    "<title>just a moment...</title>",
+    "<title>access denied</title>",
+)
+
+# Classes GAO's Drupal theme and USWDS hide elements with through CSS
+HIDDEN_CLASSES = frozenset(
+    ["hidden", "visually-hidden", "element-invisible", "element-hidden", "js-hide",
+     "display-none", "usa-sr-only"]
+)
+
+VOID_TAGS = frozenset(
+    ["area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+     "meta", "param", "source", "track", "wbr"]
+)
+
+
+def normalize_solicitation(rfq_no: str) -> str:
+    # Solicitation number without case, spaces or punctuation
+    return re.sub(r"[^A-Z0-9]", "", rfq_no.upper())
+
+
+class BotChallenge(Exception):
+    """GAO answered with a non-200 response or a bot challenge page."""
+
+
+class UnclassifiedPage(BotChallenge):
+    """Page whose visible fields depend on CSS the http backend cannot apply.
+
+    Raised for rows that read as both closed and open, or open with a
+    decision link, so the search falls back to the browser like on a
+    challenge instead of reporting different updates.
+    """
+
+
+class Node:
+    """Minimal element tree node built by TreeBuilder."""
+
+    __slots__ = ("tag", "attrs", "classes", "parent", "children")
+
+    def __init__(self, tag: str, attrs: dict, parent: "Node | None") -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = frozenset((attrs.get("class") or "").split())
+        self.parent = parent
+        self.children = []
+
+    def iter(self):
+        # Descendant elements in document order
+        stack = [child for child in reversed(self.children) if isinstance(child, Node)]
+
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(
+                child for child in reversed(node.children) if isinstance(child, Node)
+            )
+
+    def text(self) -> str:
+        # Whitespace-collapsed text content
+        parts = []
+        stack = [self]
+
+        while stack:
+            node = stack.pop()
+
+            for child in reversed(node.children):
+                if isinstance(child, Node):
+                    stack.append(child)
+                else:
+                    parts.append(child)
+
+        return " ".join("".join(reversed(parts)).split())
+
+    def visible(self) -> bool:
+        # Static approximation of is_visible(): hidden attribute, inline
+        # style or a hiding class of the GAO theme
+        node = self
+
+        while node is not None:
+            style = (node.attrs.get("style") or "").replace(" ", "").lower()
+
+            if (
+                "hidden" in node.attrs
+                or "display:none" in style
+                or "visibility:hidden" in style
+                or not node.classes.isdisjoint(HIDDEN_CLASSES)
+            ):
+                return False
+
+            node = node.parent
+
+        return True
+
+
+class TreeBuilder(HTMLParser):
+    """Build a Node tree, tolerating unclosed and mis-nested tags."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {}, None)
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, dict(attrs), self._stack[-1])
+        self._stack[-1].children.append(node)
+
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, dict(attrs), self._stack[-1])
+        self._stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                break
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    # Parse a page into a Node tree
+    builder = TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _matches(node: Node, simple: str) -> bool:
+    # Match one tag.class compound selector
+    tag, *classes = simple.split(".")
+    return (not tag or node.tag == tag) and node.classes.issuperset(classes)
+
+
+def iselect(root: Node, selector: str):
+    # Descendant combinator selector query, e.g. "div.a .b"
+    *ancestors, last = selector.split()
+
+    for node in root.iter():
+        if not _matches(node, last):
+            continue
+
+        pending = list(ancestors)
+        parent = node.parent
+
+        # Ancestors may sit above root, as with Element.querySelector
+        while pending and parent is not None:
+            if _matches(parent, pending[-1]):
+                pending.pop()
+
+            parent = parent.parent
+
+        if not pending:
+            yield node
+
+
+def select(root: Node, selector: str) -> list[Node]:
+    return list(iselect(root, selector))
+
+
+def select_one(root: Node, selector: str) -> Node | None:
+    return next(iselect(root, selector), None)
+
+
+def _visible_text(node: Node | None) -> str | None:
+    return node.text() if node is not None and node.visible() else None
+
+
+def parse_rows(html: str) -> list[dict]:
+    # Teaser rows as records, same shape as search.EXTRACT_ROWS_JS
+    return rows_from(parse_html(html))
+
+
+def next_page_from(root: Node, url: str) -> str | None:
+    # Absolute url of the results pager next link, same as search.NEXT_PAGE_JS
+    link = select_one(root, "li.pager__item--next a")
+
+    if link is None:
+        link = next(
+            (node for node in iselect(root, "a") if node.attrs.get("rel") == "next"),
+            None,
+        )
+
+    if link is None or not link.attrs.get("href"):
+        return None
+
+    return urljoin(url, link.attrs["href"])
+
+
+def rows_from(root: Node) -> list[dict]:
+    # Teaser rows of a parsed results page
+    headings = select(root, "div.teaser-search--heading")
+    rows = []
+
+    # Headings under each element, to find each teaser row in one pass
+    heading_counts = {}
+
+    for heading in headings:
+        node = heading.parent
+
+        while node is not None:
+            heading_counts[id(node)] = heading_counts.get(id(node), 0) + 1
+            node = node.parent
+
+    for heading in headings:
+        # Widen to the teaser row holding only this heading
+        row = heading
+
+        while row.parent is not None and heading_counts[id(row.parent)] == 1:
+            row = row.parent
+
+        decision = select_one(row, "div.teaser-search-decision")
+        decision_link = select_one(row, "div.teaser-search-decision a")
+        details_link = select_one(heading, "h4.heading a")
+
+        record = {
+            "heading": _visible_text(select_one(heading, "h4.heading")) or "",
+            "outcome": _visible_text(
+                select_one(row, "div.teaser-search--outcome .field__item")
+            ),
+            "status": _visible_text(
+                select_one(row, "div.teaser-search--status .field__item")
+            ),
+            "decision_date": _visible_text(
+                select_one(row, "div.teaser-search--decision_date .field__item")
+            ),
+            "decision_link": (
+                (decision_link.attrs.get("href") or "").strip()
+                if decision is not None and decision.visible() and decision_link
+                else None
+            ),
+            "details_href": (
+                details_link.attrs.get("href") if details_link is not None else None
+            ),
+        }
+
+        # Closed and open at once, or open with a decision, means the page
+        # hides one of them with CSS this parser doesn't see
+        if (record["outcome"] is not None and record["status"] is not None) or (
+            record["outcome"] is None and record["decision_link"] is not None
+        ):
+            raise UnclassifiedPage(
+                f"cannot tell which fields of {record['heading']!r} are shown"
+            )
+
+        rows.append(record)
+
+    return rows
+
+
+def parse_details(html: str) -> dict:
+    # Details page fields, same shape as search.EXTRACT_DETAILS_JS
+    root = parse_html(html)
+
+    def text(selector: str) -> str:
+        node = select_one(root, selector)
+        return node.text() if node is not None else ""
+
+    return {
+        "type": text("div.field--name-field-case-type .field__item"),
+        "filed_dt": text("div.field--name-field-filed-date .field__item"),
+        "due_dt": text("div.field--name-field-due-date .field__item"),
+        "solicitations": [
+            node.text()
+            for node in select(
+                root, "div.field--name-field-solicitation-number .field__item"
+            )
+        ],
+    }
+
+
+class HttpFetcher:
+    """Fetch GAO pages over the client urllib3 connection pool."""
+
+    def __init__(self, configuration: "client.Configuration | None" = None) -> None:
+        # The REST stack loads with the first fetcher, only http backend runs pay for it
+        from client.rest import RESTClientObject
+
+        self.rest_client = RESTClientObject(configuration or client.Configuration())
+
+    def get(self, url: str) -> str:
+        # GET a page, raising BotChallenge when a browser is needed
+        import urllib3
+        from client.rest import ApiException
+
+        with throttle.navigation():
+            try:
+                with timing.span("navigate"):
+                    response = self.rest_client.GET(
+                        url, headers=dict(HTTP_HEADERS), _request_timeout=(10, 30)
+                    )
+            except ApiException as e:
+                raise BotChallenge(f"Received HTTP {e.status}") from e
+            except urllib3.exceptions.HTTPError as e:
+                raise BotChallenge(f"Request failed: {e}") from e
+
+            html = response.data.decode("utf-8", "replace")
+            lowered = html.lower()
+
+            # A challenge page is GAO pushing back too
+            if any(marker in lowered for marker in CHALLENGE_MARKERS):
+                raise BotChallenge("Received bot challenge page")
+
+        return html
+
+    def rows(self, url: str) -> list[dict]:
+        html = self.get(url)
+
+        with timing.span("extract"):
+            return parse_rows(html)
+
+    def page(self, url: str) -> tuple[list[dict], str | None]:
+        # Rows and next page url of a results page
+        html = self.get(url)
+
+        with timing.span("extract"):
+            root = parse_html(html)
+            return rows_from(root), next_page_from(root, url)
+
+    def details(self, url: str) -> dict:
+        html = self.get(url)
+
+        with timing.span("extract"):
+            return parse_details(html)
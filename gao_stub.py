@@ -0,0 +1,347 @@
+"""
+    Offline stand-in for gao.gov bid protest search and details pages,
+    rendered from the fixtures in fixtures/gao with injectable latency,
+    errors, bot challenges and pagination. Point the scraper at it with
+    the GAO_URL environment variable.
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from gao_http import normalize_solicitation
+
+
+log = logging.getLogger("gao_stub")
+
+FIXTURES = Path(__file__).parent / "fixtures" / "gao"
+
+
+def load_templates(fixtures: Path) -> dict[str, Template]:
+    return {
+        path.stem: Template(path.read_text(encoding="utf-8"))
+        for path in fixtures.glob("*.html")
+    }
+
+
+def load_protests(fixtures: Path) -> list[dict]:
+    return json.loads((fixtures / "protests.json").read_text(encoding="utf-8"))
+
+
+def synthesize_protests(count: int, solicitations: int, seed: int = 0) -> list[dict]:
+    # Deterministic fixture records for throughput benchmarks
+    rng = random.Random(seed)
+    protests = []
+
+    for n in range(count):
+        decided = rng.random() < 0.6
+        protest = {
+            "b_number": f"B-{500000 + n}.1",
+            "company": f"Benchmark Company {n}",
+            "agency": "Department of Benchmarks",
+            "solicitations": [f"BENCH-{n % solicitations:04d}"],
+            "case_type": "Bid Protest",
+            "filed_days_ago": rng.randint(1, 120),
+        }
+
+        if decided:
+            protest["outcome"] = rng.choice(["Denied", "Dismissed", "Sustained", "Withdrawn"])
+            protest["decided_days_ago"] = rng.randint(1, protest["filed_days_ago"])
+            protest["decision"] = rng.random() < 0.5
+        else:
+            protest["status"] = "Case Currently Open"
+            protest["due_in_days"] = 100 - protest["filed_days_ago"]
+
+        protests.append(protest)
+
+    return protests
+
+
+class GaoStub:
+    """Render GAO pages for a list of protest fixture records."""
+
+    def __init__(
+        self,
+        protests: list[dict] | None = None,
+        today: date | None = None,
+        page_size: int = 20,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        challenge_rate: float = 0.0,
+        seed: int = 0,
+        fixtures: Path = FIXTURES,
+    ) -> None:
+        self.templates = load_templates(fixtures)
+        self.protests = protests if protests is not None else load_protests(fixtures)
+        self.today = today or date.today()
+        self.page_size = max(page_size, 1)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.challenge_rate = challenge_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = {}
+        # time.time() of the first request, for startup benchmarks
+        self.first_request = None
+
+    def _day(self, days_ago: int) -> date:
+        return self.today - timedelta(days=days_ago)
+
+    @staticmethod
+    def _fmt(day: date) -> str:
+        return day.strftime("%b %-d, %Y")
+
+    def _slug(self, protest: dict) -> str:
+        return protest["b_number"].lower()
+
+    def _matches(self, protest: dict, query: dict) -> bool:
+        # Apply the search form filters the scraper uses
+        solicitation = query.get("solicitation", [""])[0]
+
+        if solicitation and normalize_solicitation(solicitation) not in {
+            normalize_solicitation(s) for s in protest["solicitations"]
+        }:
+            return False
+
+        date_type = query.get("date_type", [""])[0]
+
+        if date_type:
+            start = date(*_iso(query["date_start"][0]))
+            end = date(*_iso(query["date_end"][0]))
+            days_ago = protest.get(f"{date_type}_days_ago")
+
+            if days_ago is None or not start <= self._day(days_ago) <= end:
+                return False
+
+        return True
+
+    def render_teaser(self, protest: dict) -> str:
+        t = self.templates
+        fields = {
+            "company": protest["company"],
+            "b_number": protest["b_number"],
+            "slug": self._slug(protest),
+            "agency": protest["agency"],
+            "outcome": "",
+            "status": "",
+            "decision_date": "",
+            "decision": "",
+        }
+
+        if "outcome" in protest:
+            decided = self._day(protest["decided_days_ago"])
+            fields["outcome"] = t["outcome"].substitute(outcome=protest["outcome"])
+            fields["decision_date"] = t["decision_date"].substitute(
+                iso_date=decided.isoformat(), decision_date=self._fmt(decided)
+            )
+
+            if protest.get("decision"):
+                fields["decision"] = t["decision"].substitute(slug=self._slug(protest))
+        else:
+            fields["status"] = t["status"].substitute(status=protest["status"])
+
+        return t["teaser"].substitute(fields)
+
+    def render_search(self, query: dict) -> str:
+        found = [protest for protest in self.protests if self._matches(protest, query)]
+        page_no = int(query.get("page", ["0"])[0])
+        start = page_no * self.page_size
+        rows = found[start:start + self.page_size]
+        pager = ""
+
+        if len(found) > self.page_size:
+            params = {key: values[0] for key, values in query.items()}
+            next_link = ""
+
+            if start + self.page_size < len(found):
+                next_link = self.templates["pager_next"].substitute(
+                    next="?" + urlencode(dict(params, page=page_no + 1))
+                )
+
+            pager = self.templates["pager"].substitute(
+                current="?" + urlencode(dict(params, page=page_no)),
+                page_no=page_no + 1,
+                next=next_link,
+            )
+
+        return self.templates["search"].substitute(
+            count=len(found),
+            rows="".join(self.render_teaser(protest) for protest in rows),
+            pager=pager,
+        )
+
+    def render_details(self, slug: str) -> str | None:
+        protest = next((p for p in self.protests if self._slug(p) == slug), None)
+
+        if protest is None:
+            return None
+
+        filed = self._day(protest["filed_days_ago"])
+        due = self.today + timedelta(
+            days=protest.get("due_in_days", 100 - protest["filed_days_ago"])
+        )
+        case_status = ""
+
+        if "outcome" in protest:
+            case_status = (
+                '          <div class="field field--name-field-outcome">'
+                f'<div class="field__item">{protest["outcome"]}</div></div>\n'
+            )
+
+        return self.templates["details"].substitute(
+            company=protest["company"],
+            b_number=protest["b_number"],
+            agency=protest["agency"],
+            solicitations="".join(
+                f'              <div class="field__item">{s}</div>\n'
+                for s in protest["solicitations"]
+            ),
+            case_type=protest["case_type"],
+            filed_iso=filed.isoformat(),
+            filed_dt=self._fmt(filed),
+            due_iso=due.isoformat(),
+            due_dt=self._fmt(due),
+            case_status=case_status,
+        )
+
+    def respond(self, path: str) -> tuple[int, str]:
+        # Status and body for a request path, after injected faults
+        parts = urlsplit(path)
+
+        with self._lock:
+            if self.first_request is None:
+                self.first_request = time.time()
+
+            self.requests[parts.path] = self.requests.get(parts.path, 0) + 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+
+        if delay:
+            time.sleep(delay)
+
+        if roll < self.error_rate:
+            return self.error_status, f"<html><body>HTTP {self.error_status}</body></html>"
+
+        if roll < self.error_rate + self.challenge_rate:
+            return 200, self.templates["challenge"].template
+
+        if parts.path == "/legal/bid-protests/search":
+            return 200, self.render_search(parse_qs(parts.query))
+
+        if parts.path.startswith("/products/"):
+            body = self.render_details(parts.path.removeprefix("/products/").strip("/"))
+
+            if body is not None:
+                return 200, body
+
+        return 404, "<html><body>Page not found</body></html>"
+
+
+def _iso(us_date: str) -> tuple[int, int, int]:
+    # mm/dd/yyyy to (year, month, day)
+    month, day, year = us_date.split("/")
+    return int(year), int(month), int(day)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    stub: GaoStub
+
+    def do_GET(self, send_body: bool = True):
+        status, body = self.stub.respond(self.path)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+
+        if send_body:
+            self.wfile.write(data)
+
+    def do_HEAD(self):
+        # Connection warmups
+        self.do_GET(send_body=False)
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+
+class GaoStubServer:
+    """Serve a GaoStub on localhost from a background thread.
+
+    >>> with GaoStubServer(GaoStub(page_size=2)) as server:
+    ...     search.GAO_URL = server.url
+    """
+
+    def __init__(self, stub: GaoStub | None = None, port: int = 0) -> None:
+        self.stub = stub or GaoStub()
+        handler = type("Handler", (_Handler,), {"stub": self.stub})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "GaoStubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
+
+
+""" Serve the stand-in until interrupted
+"""
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8008)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--challenge-rate", type=float, default=0.0)
+    parser.add_argument("--synthesize", type=int, default=0, help="generate N protests")
+    parser.add_argument("--solicitations", type=int, default=50)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    protests = None
+
+    if args.synthesize:
+        protests = synthesize_protests(args.synthesize, args.solicitations)
+
+    server = GaoStubServer(
+        GaoStub(
+            protests,
+            page_size=args.page_size,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            challenge_rate=args.challenge_rate,
+        ),
+        port=args.port,
+    )
+
+    with server:
+        log.info(f"Serving GAO stand-in on {server.url}")
+
+        try:
+            server._thread.join()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,149 @@
+"""
+    Append-only JSON Lines checkpoint of solicitations completed in a run,
+    so a restarted run for the same days skips them and posts the same
+    results as an uninterrupted one.
+"""
+
+import json
+import logging
+import os
+from datetime import date
+
+from records import Protest, RfqResult, as_protest
+
+
+log = logging.getLogger("search")
+
+
+class Journal:
+    """Checkpoint of completed searches for one run, keyed by its days.
+
+    The first line records the run's days; a journal left by a run for
+    other days is discarded. Each later line is one completed
+    solicitation, written with a single append so worker processes can
+    share the file, and a line cut short by a crash is ignored.
+    """
+
+    def __init__(self, path: str, days: list[date]) -> None:
+        self.path = path
+        self.header = {"days": [day.isoformat() for day in days]}
+        self.done = {}
+        self.snapshots = {}
+        self._torn = False
+        fresh = not self.load()
+
+        if fresh and os.path.exists(path):
+            log.info(f"Journal {path} is for another run, starting over")
+
+        self._fd = os.open(
+            path,
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if fresh else 0),
+            0o644,
+        )
+
+        if fresh:
+            self._append(self.header)
+        elif self._torn:
+            # End the line cut short so the next entry starts on its own
+            os.write(self._fd, b"\n")
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def load(self) -> bool:
+        # Read completed searches, False when the journal is missing or stale
+        self.done = {}
+        self.snapshots = {}
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return False
+
+        lines = content.splitlines()
+        self._torn = bool(content) and not content.endswith("\n")
+
+        if not lines or _parse(lines[0]) != self.header:
+            return False
+
+        for line in lines[1:]:
+            entry = _parse(line)
+
+            if entry is not None:
+                self.done[entry["rfq_no"]] = (
+                    [as_protest(protest) for protest in entry["protest_details"]],
+                    entry["url"],
+                )
+
+                if entry.get("snapshots") is not None:
+                    self.snapshots[entry["rfq_no"]] = entry["snapshots"]
+
+        return True
+
+    def _append(self, entry: dict) -> None:
+        os.write(self._fd, (json.dumps(entry) + "\n").encode("utf-8"))
+        os.fsync(self._fd)
+
+    def record(
+        self,
+        rfq_no: str,
+        search: tuple[list[Protest], str],
+        snapshots: list[dict] | None = None,
+    ) -> None:
+        # Checkpoint one completed solicitation search, with the store
+        # snapshots it staged to save once the run has posted
+        protest_details, url = search
+        protest_details = [as_protest(protest) for protest in protest_details]
+        entry = {
+            "rfq_no": rfq_no,
+            "protest_details": [protest.to_dict() for protest in protest_details],
+            "url": url,
+        }
+
+        if snapshots is not None:
+            entry["snapshots"] = snapshots
+            self.snapshots[rfq_no] = snapshots
+
+        self._append(entry)
+        self.done[rfq_no] = (protest_details, url)
+
+    def pending(self, rfq_pairs: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        return [pair for pair in rfq_pairs if pair[0] not in self.done]
+
+    def results(self, rfq_pairs: list[tuple[str, str]]) -> list[RfqResult]:
+        # Raw results in rfq_pairs order, including those of worker processes
+        self.load()
+        raw_results = []
+
+        for rfq_no, rfq_nm in rfq_pairs:
+            protest_details, url = self.done.get(rfq_no, ([], None))
+
+            if protest_details:
+                raw_results.append(RfqResult(rfq_no, rfq_nm, protest_details, url))
+
+        return raw_results
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _parse(line: str) -> dict | None:
+    # A journal line, None when it was cut short
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+def remove_journal(path: str) -> None:
+    # Drop a journal once its run has been posted
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,179 @@
+"""
+    Prometheus node-exporter textfile metrics for a search run, built
+    from run counters and the client.timing span recorder and written
+    at the end of main().
+"""
+
+import os
+import tempfile
+import threading
+
+from client import timing
+
+
+PREFIX = "protest_alerts"
+
+# Histogram buckets in seconds, gao navigations and teams posts
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Stages reported as latency histograms, by metric name
+HISTOGRAMS = {
+    "navigation_seconds": ("navigate", "GAO page navigation latency."),
+    "teams_post_seconds": ("teams_post", "MS Teams post latency."),
+}
+
+# Counters, by metric name
+COUNTERS = {
+    "rfqs_searched_total": "Solicitations searched.",
+    "protests_scanned_total": "Protest rows read from GAO result pages.",
+    "teams_post_bytes_total": "MS Teams post body bytes sent.",
+}
+
+# Stages whose failures are always exported, zero when none occurred
+FAILURE_STAGES = ("http", "navigate", "teams_post", "run")
+
+
+class Counters:
+    """Thread-safe run counters, optionally labelled."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.values = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def get(self, name: str, **labels) -> float:
+        with self._lock:
+            return self.values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def items(self, name: str) -> list[tuple[dict, float]]:
+        # (labels, value) pairs recorded for a counter
+        with self._lock:
+            return [
+                (dict(labels), value)
+                for (key, labels), value in sorted(self.values.items())
+                if key == name
+            ]
+
+    def merge(self, values: dict) -> None:
+        # Add counters recorded elsewhere, e.g. by a worker process
+        with self._lock:
+            for key, value in values.items():
+                self.values[key] = self.values.get(key, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.values = {}
+
+
+counters = Counters()
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    # Increment a counter on the process-wide run counters
+    counters.inc(name, value, **labels)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _series(name: str, labels: dict, value: float) -> str:
+    # One exposition line, e.g. name{stage="run"} 1
+    if labels:
+        label_str = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        name = f"{name}{{{label_str}}}"
+
+    return f"{name} {value}"
+
+
+def _header(name: str, kind: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def histogram_lines(name: str, durations: list[float]) -> list[str]:
+    # Cumulative buckets, sum and count for a list of durations
+    lines = []
+
+    for bound in BUCKETS:
+        lines.append(
+            _series(f"{name}_bucket", {"le": f"{bound:g}"}, sum(d <= bound for d in durations))
+        )
+
+    lines.append(_series(f"{name}_bucket", {"le": "+Inf"}, len(durations)))
+    lines.append(_series(f"{name}_sum", {}, round(sum(durations), 6)))
+    lines.append(_series(f"{name}_count", {}, len(durations)))
+
+    return lines
+
+
+def render(
+    run_counters: Counters,
+    recorder: timing.Recorder,
+    success: bool,
+    finished: float,
+) -> str:
+    # Textfile exposition of a run's counters, latencies and status
+    stages = {}
+
+    for record in list(recorder.spans):
+        stages.setdefault(record["stage"], []).append(record["seconds"])
+
+    lines = []
+
+    for metric, help_text in COUNTERS.items():
+        name = f"{PREFIX}_{metric}"
+        lines += _header(name, "counter", help_text)
+        lines.append(_series(name, {}, run_counters.get(metric.removesuffix("_total"))))
+
+    name = f"{PREFIX}_detail_pages_total"
+    lines += _header(name, "counter", "Protest detail pages opened.")
+    lines.append(_series(name, {}, len(stages.get("details", []))))
+
+    failures = {stage: 0 for stage in FAILURE_STAGES}
+
+    for labels, value in run_counters.items("failures"):
+        failures[labels.get("stage", "")] = value
+
+    name = f"{PREFIX}_failures_total"
+    lines += _header(name, "counter", "Failures, by stage.")
+    lines += [_series(name, {"stage": stage}, value) for stage, value in failures.items()]
+
+    for metric, (stage, help_text) in HISTOGRAMS.items():
+        name = f"{PREFIX}_{metric}"
+        lines += _header(name, "histogram", help_text)
+        lines += histogram_lines(name, sorted(stages.get(stage, [])))
+
+    name = f"{PREFIX}_run_duration_seconds"
+    lines += _header(name, "gauge", "Duration of the last run.")
+    lines.append(_series(name, {}, round(sum(stages.get("run", [])), 6)))
+
+    name = f"{PREFIX}_last_run_success"
+    lines += _header(name, "gauge", "1 when the last run completed without error.")
+    lines.append(_series(name, {}, int(success)))
+
+    name = f"{PREFIX}_last_run_timestamp_seconds"
+    lines += _header(name, "gauge", "Unix time the last run finished.")
+    lines.append(_series(name, {}, int(finished)))
+
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, text: str) -> None:
+    # Replace the textfile atomically so node-exporter never reads a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".protest_alerts.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,87 @@
+"""
+    Slotted record types for protest updates and per-solicitation
+    results, with adapters from the dict shapes of saved results and
+    test fixtures.
+"""
+
+from dataclasses import dataclass, fields
+
+
+@dataclass(slots=True)
+class Protest:
+    """One protest update, decided when decided_dt is set, else opened."""
+
+    company: str
+    status: str
+    type: str | None = None
+    decided_dt: str | None = None
+    decision_url: str | None = None
+    filed_dt: str | None = None
+    due_dt: str | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self.decided_dt is not None
+
+    @property
+    def day(self) -> str | None:
+        # GAO date the update falls on
+        return self.decided_dt or self.filed_dt
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Protest":
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        # Dict of the fields that are set
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None
+        }
+
+
+@dataclass(slots=True)
+class RfqResult:
+    """Protest updates found for one solicitation, index set when formatted."""
+
+    rfq_no: str
+    rfq_nm: str
+    protest_details: list[Protest]
+    url: str
+    index: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RfqResult":
+        return cls(
+            data["rfq_no"],
+            data["rfq_nm"],
+            [as_protest(protest) for protest in data["protest_details"]],
+            data["url"],
+            data.get("index", 0),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "rfq_no": self.rfq_no,
+            "rfq_nm": self.rfq_nm,
+            "protest_details": [protest.to_dict() for protest in self.protest_details],
+            "url": self.url,
+            "index": self.index,
+        }
+
+
+def as_protest(item: Protest | dict) -> Protest:
+    # Protest from a record or a protest_info dict
+    return item if isinstance(item, Protest) else Protest.from_dict(item)
+
+
+def as_result(item: RfqResult | dict) -> RfqResult:
+    # RfqResult from a record or a raw_results dict, protests included
+    if isinstance(item, dict):
+        return RfqResult.from_dict(item)
+
+    if not all(isinstance(protest, Protest) for protest in item.protest_details):
+        item.protest_details = [as_protest(protest) for protest in item.protest_details]
+
+    return item
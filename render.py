@@ -0,0 +1,189 @@
+"""
+    Renderers for indexed protest results: MS Teams Adaptive Card
+    TextBlocks, Markdown, JSON Lines and CSV. Each solicitation is built
+    from pre-compiled line templates joined once, and write() streams
+    one solicitation at a time to a file object.
+"""
+
+import csv
+import json
+from datetime import date
+from typing import Iterable, TextIO
+
+from records import Protest, RfqResult, as_result
+
+
+# (day, results) sections of a run, day None for today
+Sections = Iterable[tuple[date | None, list[RfqResult]]]
+
+# Line templates, compiled once to bound format methods
+HEADER = "**{:%A, %m/%d/%Y}.** Protest updates.".format
+HEADING = "**{0.index}. {0.rfq_nm}** - {0.rfq_no} - [View on GAO]({0.url})".format
+DECIDED = "- {0.company} **|** {0.type} {0.status} **|** Decided {0.decided_dt}".format
+DECIDED_REPORT = (
+    "- {0.company} **|** {0.type} {0.status} **|** Decided {0.decided_dt}"
+    " **|** [View decision](https://www.gao.gov{0.decision_url})"
+).format
+OPENED = "- {0.company} **|** {0.type} Opened **|** Filed {0.filed_dt} **|** Due {0.due_dt}".format
+
+# CSV columns, one row per protest update
+CSV_FIELDS = (
+    "day",
+    "index",
+    "rfq_no",
+    "rfq_nm",
+    "url",
+    "company",
+    "type",
+    "status",
+    "filed_dt",
+    "due_dt",
+    "decided_dt",
+    "decision_url",
+)
+
+
+def header_text(day: date | None) -> str:
+    return HEADER(day or date.today())
+
+
+def protest_line(detail: Protest) -> str | None:
+    # Markdown bullet for one update, None when it has no date
+    if detail.decided_dt is not None:
+        # Case closed, with the decision report when published
+        return DECIDED_REPORT(detail) if detail.decision_url is not None else DECIDED(detail)
+
+    if detail.filed_dt is not None:
+        # Case opened
+        return OPENED(detail)
+
+    return None
+
+
+def result_text(result: RfqResult) -> str:
+    # Markdown block for one solicitation
+    lines = [HEADING(result)]
+
+    for detail in result.protest_details:
+        line = protest_line(detail)
+
+        if line is not None:
+            lines.append(line)
+
+    return "\n\n".join(lines)
+
+
+class Renderer:
+    """Streams sections of indexed results to a text file object."""
+
+    def begin(self, out: TextIO) -> None:
+        pass
+
+    def section(self, out: TextIO, day: date | None, results: list[RfqResult]) -> None:
+        raise NotImplementedError
+
+    def end(self, out: TextIO) -> None:
+        pass
+
+    def write(self, out: TextIO, sections: Sections) -> None:
+        self.begin(out)
+
+        for day, results in sections:
+            self.section(out, day, [as_result(result) for result in results])
+
+        self.end(out)
+
+
+class AdaptiveCardRenderer(Renderer):
+    """TextBlocks of a Teams Adaptive Card body, written as a JSON array."""
+
+    def items(self, results: list[RfqResult], day: date | None = None) -> list[dict]:
+        # Header and one TextBlock per solicitation, each followed by a spacer
+        items = []
+
+        if results:
+            items += [textblock(header_text(day)), textblock("")]
+
+            for result in results:
+                items += [textblock(result_text(result)), textblock("")]
+
+        return items
+
+    def begin(self, out: TextIO) -> None:
+        self._first = True
+        out.write("[")
+
+    def section(self, out: TextIO, day: date | None, results: list[RfqResult]) -> None:
+        for item in self.items(results, day):
+            out.write("\n  " if self._first else ",\n  ")
+            out.write(json.dumps(item))
+            self._first = False
+
+    def end(self, out: TextIO) -> None:
+        out.write("]\n" if self._first else "\n]\n")
+
+
+class MarkdownRenderer(Renderer):
+    """Plain Markdown, a header per day and a block per solicitation."""
+
+    def section(self, out: TextIO, day: date | None, results: list[RfqResult]) -> None:
+        if not results:
+            return
+
+        out.write(f"{header_text(day)}\n\n")
+
+        for result in results:
+            out.write(f"{result_text(result)}\n\n")
+
+
+class JsonLinesRenderer(Renderer):
+    """One JSON object per solicitation, readable by RfqResult.from_dict."""
+
+    def section(self, out: TextIO, day: date | None, results: list[RfqResult]) -> None:
+        day_str = (day or date.today()).isoformat()
+
+        for result in results:
+            out.write(json.dumps({"day": day_str, **result.to_dict()}) + "\n")
+
+
+class CsvRenderer(Renderer):
+    """One CSV row per protest update."""
+
+    def begin(self, out: TextIO) -> None:
+        self._writer = csv.DictWriter(out, CSV_FIELDS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def section(self, out: TextIO, day: date | None, results: list[RfqResult]) -> None:
+        day_str = (day or date.today()).isoformat()
+
+        for result in results:
+            row = {
+                "day": day_str,
+                "index": result.index,
+                "rfq_no": result.rfq_no,
+                "rfq_nm": result.rfq_nm,
+                "url": result.url,
+            }
+
+            for detail in result.protest_details:
+                self._writer.writerow({**row, **detail.to_dict()})
+
+
+# Renderers by --output-format name
+RENDERERS = {
+    "card": AdaptiveCardRenderer,
+    "markdown": MarkdownRenderer,
+    "jsonl": JsonLinesRenderer,
+    "csv": CsvRenderer,
+}
+
+
+def textblock(content: str) -> dict:
+    # Build TextBlock for MS Teams
+    return {"type": "TextBlock", "text": content, "wrap": True}
+
+
+def write_path(path: str, output_format: str, sections: Sections) -> None:
+    # Render sections to a file, one solicitation at a time
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        RENDERERS[output_format]().write(out, sections)
@@ -3,349 +3,2076 @@
     from GAO and post results to MS Teams. 
 """
 
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, replace
 from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
-from playwright.sync_api import BrowserContext, Page, sync_playwright
+import cards
 import client
-from client.rest import ApiException
+import metrics
+import render
+import throttle
+from client import pools, timing
+from gao_http import BotChallenge, HttpFetcher, normalize_solicitation
+from journal import Journal, remove_journal
+from records import Protest, RfqResult, as_result
+from store import ProtestStore, SnapshotDiff, pending_snapshots
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
+    from playwright.async_api import Page as AsyncPage
+    from playwright.sync_api import BrowserContext, Page
 
 
 log = logging.getLogger("search")
 logging.basicConfig(level=logging.INFO)
 
+# Overridable to point the scraper at an offline stand-in, see gao_stub.py
+GAO_URL = os.environ.get("GAO_URL", "https://www.gao.gov")
+
+CONTEXT_OPTIONS = {
+    "viewport": {'width': 1920, 'height': 1080},
+    "screen": {'width': 1920, 'height': 1080},
+    "device_scale_factor": 1,
+    "is_mobile": False,
+    "has_touch": False,
+    "user_agent": 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    "locale": 'en-US',
+    "timezone_id": 'America/New_York',
+    "permissions": ['geolocation'],
+    "geolocation": {'latitude': 40.7128, 'longitude': -74.0060},
+    "color_scheme": 'light',
+    "reduced_motion": 'no-preference',
+    "forced_colors": 'none',
+    "extra_http_headers": {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Upgrade-Insecure-Requests': '1',
+        'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Linux"',
+        'DNT': '1',
+        'Connection': 'keep-alive'
+    },
+}
+
+
+# Target GAO date string, or every date string of a backfill range
+Days = str | frozenset[str]
+
+
+def sync_playwright():
+    # Playwright is imported on first browser launch, most runs never launch one
+    from playwright.sync_api import sync_playwright
+
+    return sync_playwright()
+
+
+def async_playwright():
+    from playwright.async_api import async_playwright
+
+    return async_playwright()
+
+
+@dataclass
+class RunOptions:
+    """Tunable settings for a search run."""
+
+    # Number of solicitations searched at once, 1 keeps the sync engine
+    concurrency: int = 1
+    # Details tabs kept open per solicitation
+    details_pool_size: int = 2
+    # Visits before a details tab is closed and replaced
+    details_max_uses: int = 20
+    # "http" reads pages without a browser, falling back to "playwright"
+    backend: str = "playwright"
+    # Abort requests the scraper never reads during gao navigation
+    block_resources: bool = True
+    # Resource types aborted when block_resources is set. Stylesheets are
+    # opt-in, GAO hides some row fields with CSS and visibility needs them
+    block_types: tuple[str, ...] = ("image", "font", "media")
+    # Hosts or url substrings never blocked
+    block_allowlist: tuple[str, ...] = ()
+    # List the day's protests once and match them locally against rfq_list
+    feed: bool = False
+    # SQLite snapshot store, reports only new or changed protests when set
+    store_path: str | None = None
+    # Log file, the run report is written next to it
+    log_file: str | None = None
+    # Per-stage timing report, defaults to <log_file>.report.json
+    report_path: str | None = None
+    # Prometheus node-exporter textfile written at the end of the run
+    metrics_path: str | None = None
+    # GAO navigations per second across the run, 0 disables the limit
+    rate_limit: float = 2.0
+    # Navigations allowed back to back before rate_limit applies
+    rate_burst: int = 4
+    # Navigation seconds above which concurrency stops growing
+    latency_target: float = 5.0
+    # Backfill range, both default to yesterday
+    start_date: date | None = None
+    end_date: date | None = None
+    # State file of the last successful run, backfills from the day after
+    since_last_run: str | None = None
+    # (i, n): search only shard i of n of the rfq list, by stable hash
+    shard: tuple[int, int] | None = None
+    # Worker processes, each searching one shard on its own browser
+    workers: int = 1
+    # Write raw shard results here instead of posting
+    results_out: str | None = None
+    # Shard result files merged and posted instead of searching
+    merge_paths: tuple[str, ...] = ()
+    # Checkpoint journal, a restarted run skips solicitations already in it
+    journal_path: str | None = None
+    # Post updates in micro-batches as solicitations complete
+    stream: bool = False
+    # Solicitations with updates per streamed post
+    batch_size: int = 5
+    # Seconds a streamed update waits for its batch to fill
+    batch_seconds: float = 5.0
+    # Serialized bytes per Teams message, larger posts are split
+    card_bytes: int = cards.MAX_BYTES
+    # Results file written alongside the post, in output_format
+    output_path: str | None = None
+    # "card", "markdown", "jsonl" or "csv"
+    output_format: str = "markdown"
+    # Connect to the webhook host while searching, so the post reuses it
+    warmup: bool = False
+
+
+# Analytics and tracking hosts loaded by gao.gov pages
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "dap.digitalgov.gov",
+    "siteimproveanalytics.com",
+    "siteimprove.com",
+    "facebook.net",
+    "hotjar.com",
+    "nr-data.net",
+    "newrelic.com",
+)
+
+
+class ResourceBlocker:
+    """Request interception for gao navigation.
+
+    Aborts configured resource types, tracker hosts and third-party
+    scripts unless allowlisted, and counts per-run blocked requests and
+    bytes loaded by the requests let through.
+    """
+
+    def __init__(self, options: RunOptions) -> None:
+        self.block_types = frozenset(options.block_types)
+        self.allowlist = options.block_allowlist
+        self.blocked = {}
+        self.allowed = 0
+        self.loaded_bytes = 0
+
+    def should_block(self, url: str, resource_type: str) -> str | None:
+        # Reason to block a request, None to let it through
+        if any(allowed in url for allowed in self.allowlist):
+            return None
+
+        host = urlsplit(url).hostname or ""
+
+        if any(host == domain or host.endswith(f".{domain}") for domain in TRACKER_DOMAINS):
+            return "tracker"
+
+        if resource_type in self.block_types:
+            return resource_type
+
+        if resource_type == "script" and not (
+            host == "gao.gov" or host.endswith(".gao.gov")
+        ):
+            return "third-party script"
+
+        return None
+
+    def record(self, reason: str | None) -> bool:
+        # Count a routing decision, True when the request is blocked
+        if reason is None:
+            self.allowed += 1
+            return False
+
+        self.blocked[reason] = self.blocked.get(reason, 0) + 1
+        return True
+
+    def on_response(self, response) -> None:
+        # Tally body bytes of requests let through
+        self.loaded_bytes += int(response.headers.get("content-length") or 0)
+
+    def handle(self, route) -> None:
+        # Sync route handler
+        request = route.request
+
+        if self.record(self.should_block(request.url, request.resource_type)):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route) -> None:
+        # Async route handler
+        request = route.request
+
+        if self.record(self.should_block(request.url, request.resource_type)):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def stats(self) -> dict:
+        return {
+            "blocked": sum(self.blocked.values()),
+            "blocked_by_reason": dict(self.blocked),
+            "allowed": self.allowed,
+            "loaded_bytes": self.loaded_bytes,
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        log.info(
+            f"Blocked {stats['blocked']} requests {stats['blocked_by_reason']}, "
+            f"allowed {stats['allowed']}, loaded {stats['loaded_bytes']} bytes"
+        )
+
+
+class BrowserSession:
+    """Run-scoped Chromium browser shared by every solicitation search.
+
+    Chromium is launched on the first call to new_context(), so runs that
+    never search do not pay the startup cost. Use as a context manager to
+    guarantee the browser is closed, even when a search raises.
+    """
+
+    def __init__(self, options: RunOptions | None = None) -> None:
+        self.options = options or RunOptions()
+        self.http = (
+            HttpFetcher(gao_config(self.options)) if self.options.backend == "http" else None
+        )
+        self.blocker = (
+            ResourceBlocker(self.options) if self.options.block_resources else None
+        )
+        self.store = (
+            ProtestStore(self.options.store_path) if self.options.store_path else None
+        )
+        self._playwright = None
+        self.browser = None
+
+    def __enter__(self) -> "BrowserSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def new_context(self) -> BrowserContext:
+        # Fresh, isolated context on the shared browser
+        if self.browser is None:
+            log.info("Launching browser")
+            with timing.span("browser_launch"):
+                self._playwright = sync_playwright().start()
+                self.browser = self._playwright.chromium.launch(headless=True,)
+
+        context = self.browser.new_context(**CONTEXT_OPTIONS)
+
+        if self.blocker is not None:
+            context.route("**/*", self.blocker.handle)
+            context.on("response", self.blocker.on_response)
+
+        return context
+
+    def diff(self, rfq_no: str) -> SnapshotDiff | None:
+        # Snapshot change detection for a solicitation, when a store is set
+        return self.store.diff(rfq_no) if self.store is not None else None
+
+    def details_pool(self, context: BrowserContext) -> "DetailsPool":
+        # Details tab pool for a context
+        return DetailsPool(
+            context, self.options.details_pool_size, self.options.details_max_uses
+        )
+
+    def close(self) -> None:
+        # Close browser and stop playwright
+        try:
+            if self.browser is not None:
+                if self.blocker is not None:
+                    self.blocker.log_stats()
+
+                self.browser.close()
+        finally:
+            if self._playwright is not None:
+                self._playwright.stop()
+
+            if self.store is not None:
+                self.store.close()
+                self.store = None
+
+            self.browser = None
+            self._playwright = None
+
+
+# One round trip per results page: every teaser row as a structured record
+EXTRACT_ROWS_JS = """
+() => {
+    const visible = (el) => !!el && el.getClientRects().length > 0;
+    const text = (el) => (visible(el) ? el.innerText.trim() : null);
+    const headings = Array.from(
+        document.querySelectorAll("div.teaser-search--heading")
+    );
+
+    return headings.map((heading) => {
+        // Widen to the teaser row holding only this heading
+        let row = heading;
+
+        while (
+            row.parentElement &&
+            row.parentElement.querySelectorAll("div.teaser-search--heading").length === 1
+        ) {
+            row = row.parentElement;
+        }
+
+        const decision = row.querySelector("div.teaser-search-decision");
+        const decisionLink = row.querySelector("div.teaser-search-decision a");
+        const detailsLink = heading.querySelector("h4.heading a");
+
+        return {
+            heading: text(heading.querySelector("h4.heading")) || "",
+            outcome: text(row.querySelector("div.teaser-search--outcome .field__item")),
+            status: text(row.querySelector("div.teaser-search--status .field__item")),
+            decision_date: text(
+                row.querySelector("div.teaser-search--decision_date .field__item")
+            ),
+            decision_link:
+                visible(decision) && decisionLink
+                    ? (decisionLink.getAttribute("href") || "").trim()
+                    : null,
+            details_href: detailsLink ? detailsLink.getAttribute("href") : null,
+        };
+    });
+}
+"""
+
+# One round trip per details page
+EXTRACT_DETAILS_JS = """
+() => {
+    const text = (selector) => {
+        const el = document.querySelector(selector);
+        return el ? el.innerText.trim() : "";
+    };
+
+    return {
+        type: text("div.field--name-field-case-type .field__item"),
+        filed_dt: text("div.field--name-field-filed-date .field__item"),
+        due_dt: text("div.field--name-field-due-date .field__item"),
+        solicitations: Array.from(
+            document.querySelectorAll(
+                "div.field--name-field-solicitation-number .field__item"
+            )
+        ).map((el) => el.innerText.trim()),
+    };
+}
+"""
+
+# Absolute url of the results pager next link, null on the last page
+NEXT_PAGE_JS = """
+() => {
+    const next = document.querySelector("li.pager__item--next a, a[rel='next']");
+    return next ? next.href : null;
+}
+"""
+
+# One round trip per results page: teaser rows plus the pager next link
+EXTRACT_PAGE_JS = f"() => ({{ rows: ({EXTRACT_ROWS_JS.strip()})(), next: ({NEXT_PAGE_JS.strip()})() }})"
+
+
+def split_rows(rows: list[dict]) -> tuple[list[dict], list[dict]]:
+    # Split teaser rows into closed and open protests
+    metrics.inc("protests_scanned", len(rows))
+    closed_rows = [row for row in rows if row["outcome"] is not None]
+    open_rows = [row for row in rows if row["status"] is not None]
+    log.info(f"{len(closed_rows)} closed protests, {len(open_rows)} open protests")
+
+    return closed_rows, open_rows
+
+
+def ordered_rows(rows: list[dict]) -> list[tuple[dict, bool]]:
+    # (row, closed) pairs for a page, closed protests first
+    closed_rows, open_rows = split_rows(rows)
+
+    return [(row, True) for row in closed_rows] + [(row, False) for row in open_rows]
+
+
+def gao_date(day: date) -> str:
+    # Date as GAO prints it, e.g. Feb 2, 2024
+    return day.strftime("%b %-d, %Y")
+
+
+def on_day(value: str | None, yday: Days) -> bool:
+    # Whether a GAO date string falls on the target day or range
+    if isinstance(yday, frozenset):
+        return value in yday
+
+    return value == yday
+
+
+def needs_details(
+    row: dict, closed: bool, yday: Days, diff: SnapshotDiff | None = None
+) -> bool:
+    # Whether a row may be an update, worth a details page visit
+    if closed:
+        log.info(f"Decided date: {row['decision_date']}")
+
+    if diff is not None:
+
+        if diff.unchanged(row):
+            return False
+
+        if not diff.seeding:
+            return True
+
+    if closed and not on_day(row["decision_date"], yday):
+
+        if diff is not None:
+            diff.record(row)
+
+        return False
+
+    return True
 
-def get_details_page(i: int, page: Page, context: BrowserContext) -> Page:
-    # Go to details page
 
-    details_link = (
-        page.locator("div.teaser-search--heading h4.heading a")
-        .nth(i)
-        .get_attribute("href")
+def build_protest(
+    row: dict, closed: bool, details: dict, yday: Days, diff: SnapshotDiff | None = None
+) -> Protest | None:
+    # Protest info for a candidate row, None when it is not an update
+    if closed:
+        protest_info = closed_protest(row, details)
+    else:
+        protest_info = opened_protest(row, details)
+
+    if diff is not None:
+        diff.record(row, protest_info)
+
+    if (diff is not None and not diff.seeding) or closed or on_day(details["filed_dt"], yday):
+        log.info("Protest updated" if closed else "Opened protest")
+        return protest_info
+
+    return None
+
+
+def closed_protest(row: dict, details: dict) -> Protest:
+    # Build protest info for a decided protest
+    return Protest(
+        company=row["heading"].split(" (")[0].strip(),
+        status=row["outcome"],
+        type=details["type"],
+        decided_dt=row["decision_date"],
+        # Set when the decision report is published
+        decision_url=row["decision_link"] or None,
     )
-    details_url = f"https://www.gao.gov{details_link}"
-    new_tab = context.new_page()
-    new_tab.goto(details_url)
-    return new_tab
 
 
-def search(rfq_no: str, yday: str) -> tuple[list[dict], str]:
-    # Execute gao search
+def opened_protest(row: dict, details: dict) -> Protest:
+    # Build protest info for a newly filed protest
+    status = row["status"]
+
+    if status == "Case Currently Open":
+        status = "Opened"
+
+    return Protest(
+        company=row["heading"].split(" (")[0].strip(),
+        status=status,
+        type=details["type"],
+        filed_dt=details["filed_dt"],
+        due_dt=details["due_dt"],
+    )
 
-    url = f"https://www.gao.gov/legal/bid-protests/search?processed=1&solicitation={rfq_no}&outcome=all#s-skipLinkTargetForMainSearchResults"
-    protest_details = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True,)
-        context = browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            screen={'width': 1920, 'height': 1080},
-            device_scale_factor=1,
-            is_mobile=False,
-            has_touch=False,
-            user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            locale='en-US',
-            timezone_id='America/New_York',
-            permissions=['geolocation'],
-            geolocation={'latitude': 40.7128, 'longitude': -74.0060},
-            color_scheme='light',
-            reduced_motion='no-preference',
-            forced_colors='none',
-            extra_http_headers={
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'Upgrade-Insecure-Requests': '1',
-                'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Linux"',
-                'DNT': '1',
-                'Connection': 'keep-alive'
-            }
+class DetailsPool:
+    """Bounded pool of reusable details tabs on one browser context.
+
+    Tabs navigate in place instead of being opened per protest. A tab is
+    closed and replaced after max_uses visits to cap Chromium memory, and
+    at most size idle tabs are kept.
+    """
+
+    def __init__(self, context: BrowserContext, size: int, max_uses: int) -> None:
+        self.context = context
+        self.size = max(size, 1)
+        self.max_uses = max(max_uses, 1)
+        self._idle = []
+        self.opened = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def _take_idle(self) -> tuple | None:
+        # Pop an idle (page, uses) pair for reuse
+        if self._idle:
+            self.reused += 1
+            return self._idle.pop()
+
+        return None
+
+    def _keep(self, page, uses: int) -> bool:
+        # Return page to the idle list unless it is worn out or surplus
+        if uses < self.max_uses and len(self._idle) < self.size:
+            self._idle.append((page, uses))
+            return True
+
+        if uses >= self.max_uses:
+            self.recycled += 1
+
+        return False
+
+    def stats(self) -> dict:
+        return {"opened": self.opened, "reused": self.reused, "recycled": self.recycled}
+
+    def fetch(self, details_href: str) -> dict:
+        # Read a protest details page on a pooled tab
+        page, uses = self._take_idle() or (None, 0)
+
+        if page is None:
+            page = self.context.new_page()
+            self.opened += 1
+
+        try:
+            with throttle.navigation() as nav, timing.span("navigate"):
+                response = page.goto(f"{GAO_URL}{details_href}")
+                nav.status = response.status if response is not None else 200
+
+            with timing.span("extract"):
+                return page.evaluate(EXTRACT_DETAILS_JS)
+        finally:
+            if not self._keep(page, uses + 1):
+                page.close()
+
+    def close(self) -> None:
+        # Close idle tabs and report pool usage
+        for page, _ in self._idle:
+            page.close()
+
+        self._idle = []
+        log.info(
+            f"Details pool opened {self.opened} pages, reused {self.reused}, "
+            f"recycled {self.recycled}"
         )
-        page = context.new_page()
-        response = page.goto(url)
-        
+
+
+def iter_pages(read_page, url: str):
+    # Teaser rows page by page, following the results pager lazily
+    seen = set()
+
+    while url and url not in seen:
+        seen.add(url)
+        rows, url = read_page(url)
+        yield rows
+
+
+def iter_rows(read_page, url: str):
+    # Teaser rows one at a time across every results page
+    for rows in iter_pages(read_page, url):
+        yield from rows
+
+
+def browser_reader(page: Page):
+    # read_page for iter_pages navigating a browser tab
+
+    def read_page(url: str) -> tuple[list[dict], str | None]:
+        with throttle.navigation() as nav, timing.span("navigate"):
+            response = page.goto(url)
+            nav.status = response.status
+
         if response.status != 200:
-            browser.close()
+            metrics.inc("failures", stage="navigate")
             raise Exception(f"Received HTTP {response.status}")
-    
-        protest_count = page.locator("div.teaser-search--bookmark").count()
-        log.info(f"{protest_count} protests found")
-
-        if protest_count > 0:
-
-            closed_protest_count = page.locator(
-                "div.teaser-search--outcome .field__item"
-            ).count()
-            open_protest_count = page.locator(
-                "div.teaser-search--status .field__item"
-            ).count()
-            log.info(
-                f"{closed_protest_count} closed protests, {open_protest_count} open protests"
+
+        with timing.span("extract"):
+            result = page.evaluate(EXTRACT_PAGE_JS)
+        return result["rows"], result["next"]
+
+    return read_page
+
+
+def collect_protests(
+    pages, yday: Days, fetch_details, diff: SnapshotDiff | None = None
+) -> list[Protest]:
+    # Build protest details for updated rows, one page at a time
+    protest_details = []
+    protest_count = 0
+
+    for rows in pages:
+        protest_count += len(rows)
+
+        for row, closed in ordered_rows(rows):
+
+            if needs_details(row, closed, yday, diff):
+
+                with timing.span("details", protest=row["details_href"]):
+                    details = fetch_details(row["details_href"])
+
+                protest_info = build_protest(row, closed, details, yday, diff)
+
+                if protest_info is not None:
+                    protest_details.append(protest_info)
+
+    log.info(f"{protest_count} protests found")
+    return protest_details
+
+
+def scrape_results(
+    context: BrowserContext,
+    url: str,
+    yday: Days,
+    details_pool: DetailsPool,
+    diff: SnapshotDiff | None = None,
+) -> list[Protest]:
+    # Scrape protest details from every gao search results page
+    page = context.new_page()
+    pages = iter_pages(browser_reader(page), url)
+
+    return collect_protests(pages, yday, details_pool.fetch, diff)
+
+
+def scrape_http(
+    http: HttpFetcher, url: str, yday: Days, diff: SnapshotDiff | None = None
+) -> list[Protest]:
+    # Scrape protest details without a browser
+    return collect_protests(
+        iter_pages(http.page, url),
+        yday,
+        lambda details_href: http.details(f"{GAO_URL}{details_href}"),
+        diff,
+    )
+
+
+def search_url(rfq_no: str) -> str:
+    # Build gao search url for a solicitation
+    return f"{GAO_URL}/legal/bid-protests/search?processed=1&solicitation={rfq_no}&outcome=all#s-skipLinkTargetForMainSearchResults"
+
+
+def search(
+    rfq_no: str, yday: Days, session: "BrowserSession | None" = None
+) -> tuple[list[Protest], str]:
+    # Execute gao search
+
+    url = search_url(rfq_no)
+
+    if session is None:
+        with BrowserSession() as session:
+            return search(rfq_no, yday, session)
+
+    if session.http is not None:
+        diff = session.diff(rfq_no)
+
+        try:
+            protest_details = scrape_http(session.http, url, yday, diff)
+        except BotChallenge as e:
+            metrics.inc("failures", stage="http")
+            log.warning(f"{e}, falling back to browser")
+        else:
+            if diff is not None:
+                pending_snapshots.stage(diff)
+
+            return protest_details, url
+
+    # Fresh context per solicitation, browser shared across the run
+    context = session.new_context()
+    details_pool = session.details_pool(context)
+    diff = session.diff(rfq_no)
+
+    try:
+        protest_details = scrape_results(context, url, yday, details_pool, diff)
+    finally:
+        details_pool.close()
+        context.close()
+
+    if diff is not None:
+        pending_snapshots.stage(diff)
+
+    return protest_details, url
+
+
+# Gao date searches listing the day's protests, by date type
+FEED_DATE_TYPES = ("decided", "filed")
+
+
+def feed_url(date_type: str, day: date, end: date | None = None) -> str:
+    # Build gao search url listing every protest for a date or date range
+    start_str = day.strftime("%m/%d/%Y")
+    end_str = (end or day).strftime("%m/%d/%Y")
+    return f"{GAO_URL}/legal/bid-protests/search?processed=1&outcome=all&date_type={date_type}&date_start={start_str}&date_end={end_str}"
+
+
+def read_feed(read_page, urls: list[str]):
+    # Teaser rows page by page across each feed url, deduplicated
+    seen_rows = set()
+
+    for url in urls:
+
+        for rows in iter_pages(read_page, url):
+            rows = [row for row in rows if row["details_href"] not in seen_rows]
+            seen_rows.update(row["details_href"] for row in rows)
+            yield rows
+
+
+def match_feed(
+    pages,
+    yday: Days,
+    fetch_details,
+    index: dict[str, str],
+    store: ProtestStore | None = None,
+) -> dict[str, list[Protest]]:
+    # Protest details per rfq_no for feed rows on watched solicitations,
+    # new or changed ones when a store is set
+    matched = {}
+    diffs = {}
+
+    def diff(rfq_no: str | None) -> SnapshotDiff | None:
+        # Snapshot change detection for a solicitation, created on first use
+        if store is None or rfq_no is None:
+            return None
+
+        if rfq_no not in diffs:
+            diffs[rfq_no] = store.diff(rfq_no)
+
+        return diffs[rfq_no]
+
+    def watched(details: dict) -> str | None:
+        for solicitation in details.get("solicitations", []):
+            rfq_no = index.get(normalize_solicitation(solicitation))
+
+            if rfq_no is not None:
+                return rfq_no
+
+        return None
+
+    for rows in pages:
+
+        for row, closed in ordered_rows(rows):
+
+            # A stored row is checked against the solicitation it was stored
+            # for, others need their details to tell if they are watched
+            stored = diff(store.rfq_of(row)) if store is not None else None
+
+            if needs_details(row, closed, yday, stored):
+
+                with timing.span("details", protest=row["details_href"]):
+                    details = fetch_details(row["details_href"])
+
+                rfq_no = watched(details)
+
+                if rfq_no is not None:
+                    protest_info = build_protest(row, closed, details, yday, diff(rfq_no))
+
+                    if protest_info is not None:
+                        log.info(f"Matched {rfq_no}")
+                        matched.setdefault(rfq_no, []).append(protest_info)
+
+    for rfq_diff in diffs.values():
+        pending_snapshots.stage(rfq_diff)
+
+    return matched
+
+
+def feed_search(
+    rfq_pairs: list[tuple[str, str]],
+    day: date,
+    yday: Days,
+    session: BrowserSession,
+    end: date | None = None,
+) -> list[tuple[list[Protest], str]]:
+    # Crawl the protest listings for day, or day to end, once and match against rfq_pairs
+    index = {normalize_solicitation(rfq_no): rfq_no for rfq_no, _ in rfq_pairs}
+    urls = [feed_url(date_type, day, end) for date_type in FEED_DATE_TYPES]
+    matched = None
+
+    if session.http is not None:
+        try:
+            matched = match_feed(
+                read_feed(session.http.page, urls),
+                yday,
+                lambda details_href: session.http.details(f"{GAO_URL}{details_href}"),
+                index,
+                session.store,
             )
+        except BotChallenge as e:
+            metrics.inc("failures", stage="http")
+            log.warning(f"{e}, falling back to browser")
 
-            for i in range(closed_protest_count):
+    if matched is None:
+        context = session.new_context()
+        details_pool = session.details_pool(context)
 
-                protest_info = {}
+        try:
+            pages = read_feed(browser_reader(context.new_page()), urls)
+            matched = match_feed(pages, yday, details_pool.fetch, index, session.store)
+        finally:
+            details_pool.close()
+            context.close()
 
-                if (
-                    page.locator("div.teaser-search--outcome .field__item")
-                    .nth(i)
-                    .is_visible()
-                ):
-                    # Closed protest
+    return [
+        (matched.get(rfq_no, []), search_url(rfq_no)) for rfq_no, _ in rfq_pairs
+    ]
+
+
+class AsyncBrowserSession:
+    """Run-scoped Chromium browser for the asyncio search engine.
+
+    Async counterpart of BrowserSession: Chromium is launched once on first
+    use and every concurrent search gets its own context on it.
+    """
+
+    def __init__(self, options: RunOptions | None = None) -> None:
+        self.options = options or RunOptions()
+        self.http = (
+            HttpFetcher(gao_config(self.options)) if self.options.backend == "http" else None
+        )
+        self.blocker = (
+            ResourceBlocker(self.options) if self.options.block_resources else None
+        )
+        self.store = (
+            ProtestStore(self.options.store_path) if self.options.store_path else None
+        )
+        self._playwright = None
+        self.browser = None
+        self._launch_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncBrowserSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def new_context(self) -> AsyncBrowserContext:
+        # Fresh, isolated context on the shared browser
+        async with self._launch_lock:
+            if self.browser is None:
+                log.info("Launching browser")
+                with timing.span("browser_launch"):
+                    self._playwright = await async_playwright().start()
+                    self.browser = await self._playwright.chromium.launch(headless=True,)
+
+        context = await self.browser.new_context(**CONTEXT_OPTIONS)
+
+        if self.blocker is not None:
+            await context.route("**/*", self.blocker.handle_async)
+            context.on("response", self.blocker.on_response)
+
+        return context
+
+    diff = BrowserSession.diff
+
+    def details_pool(self, context: AsyncBrowserContext) -> "AsyncDetailsPool":
+        # Details tab pool for a context
+        return AsyncDetailsPool(
+            context, self.options.details_pool_size, self.options.details_max_uses
+        )
+
+    async def close(self) -> None:
+        # Close browser and stop playwright
+        try:
+            if self.browser is not None:
+                if self.blocker is not None:
+                    self.blocker.log_stats()
+
+                await self.browser.close()
+        finally:
+            if self._playwright is not None:
+                await self._playwright.stop()
+
+            if self.store is not None:
+                self.store.close()
+                self.store = None
+
+            self.browser = None
+            self._playwright = None
+
+
+class AsyncDetailsPool(DetailsPool):
+    """Async counterpart of DetailsPool.
+
+    At most size tabs are in use at once, callers beyond that wait for a
+    tab to be returned.
+    """
+
+    def __init__(
+        self, context: AsyncBrowserContext, size: int, max_uses: int
+    ) -> None:
+        super().__init__(context, size, max_uses)
+        self._slots = asyncio.Semaphore(self.size)
+
+    async def fetch(self, details_href: str) -> dict:
+        # Read a protest details page on a pooled tab
+        async with self._slots:
+            page, uses = self._take_idle() or (None, 0)
+
+            if page is None:
+                page = await self.context.new_page()
+                self.opened += 1
+
+            try:
+                async with throttle.anavigation() as nav:
+
+                    with timing.span("navigate"):
+                        response = await page.goto(f"{GAO_URL}{details_href}")
+
+                    nav.status = response.status if response is not None else 200
+
+                with timing.span("extract"):
+                    return await page.evaluate(EXTRACT_DETAILS_JS)
+            finally:
+                if not self._keep(page, uses + 1):
+                    await page.close()
+
+    async def close(self) -> None:
+        # Close idle tabs and report pool usage
+        for page, _ in self._idle:
+            await page.close()
+
+        self._idle = []
+        log.info(
+            f"Details pool opened {self.opened} pages, reused {self.reused}, "
+            f"recycled {self.recycled}"
+        )
+
+
+def async_browser_reader(page: AsyncPage):
+    # read_page for aiter_pages navigating a browser tab
+
+    async def read_page(url: str) -> tuple[list[dict], str | None]:
+        async with throttle.anavigation() as nav:
+
+            with timing.span("navigate"):
+                response = await page.goto(url)
+
+            nav.status = response.status
+
+        if response.status != 200:
+            metrics.inc("failures", stage="navigate")
+            raise Exception(f"Received HTTP {response.status}")
+
+        with timing.span("extract"):
+            result = await page.evaluate(EXTRACT_PAGE_JS)
+        return result["rows"], result["next"]
+
+    return read_page
+
+
+async def aiter_pages(read_page, url: str):
+    # Async counterpart of iter_pages
+    seen = set()
+
+    while url and url not in seen:
+        seen.add(url)
+        rows, url = await read_page(url)
+        yield rows
+
+
+async def scrape_results_async(
+    context: AsyncBrowserContext,
+    url: str,
+    yday: Days,
+    details_pool: AsyncDetailsPool,
+    diff: SnapshotDiff | None = None,
+) -> list[Protest]:
+    # Async counterpart of scrape_results
+    protest_details = []
+    protest_count = 0
+    page = await context.new_page()
+
+    async for rows in aiter_pages(async_browser_reader(page), url):
+        protest_count += len(rows)
+
+        for row, closed in ordered_rows(rows):
+
+            if needs_details(row, closed, yday, diff):
+
+                with timing.span("details", protest=row["details_href"]):
+                    details = await details_pool.fetch(row["details_href"])
+
+                protest_info = build_protest(row, closed, details, yday, diff)
+
+                if protest_info is not None:
+                    protest_details.append(protest_info)
+
+    log.info(f"{protest_count} protests found")
+    return protest_details
 
-                    decided_dt = (
-                        page.locator("div.teaser-search--decision_date .field__item")
-                        .nth(i)
-                        .inner_text()
-                        .strip()
-                    )
 
-                    log.info(f"Decided date: {decided_dt}")
-
-                    if decided_dt == yday:
-                        log.info("Protest updated")
-                        protest_info["company"] = (
-                            page.locator("div.teaser-search--heading h4.heading")
-                            .nth(i)
-                            .inner_text()
-                            .split(" (")[0]
-                            .strip()
-                        )
-                        protest_info["status"] = (
-                            page.locator("div.teaser-search--outcome .field__item")
-                            .nth(i)
-                            .inner_text()
-                            .strip()
-                        )
-                        protest_info["decided_dt"] = (
-                            page.locator(
-                                "div.teaser-search--decision_date .field__item"
-                            )
-                            .nth(i)
-                            .inner_text()
-                            .strip()
-                        )
-
-                        if (
-                            page.locator("div.teaser-search-decision")
-                            .nth(i)
-                            .is_visible()
-                        ):
-                            # Decision report published
-                            protest_info["decision_url"] = (
-                                page.locator("div.teaser-search-decision a")
-                                .nth(i)
-                                .get_attribute("href")
-                                .strip()
-                            )
-
-                        # Go to details page
-                        details_page = get_details_page(i, page, context)
-
-                        protest_info["type"] = (
-                            details_page.locator(
-                                "div.field--name-field-case-type .field__item"
-                            )
-                            .inner_text()
-                            .strip()
-                        )
-
-                        protest_details.append(protest_info)
-
-            for i in range(open_protest_count):
-
-                protest_info = {}
-
-                if (
-                    page.locator("div.teaser-search--status .field__item")
-                    .nth(i)
-                    .is_visible()
-                ):
-                    # Open protest
-
-                    # Go to details page
-                    details_page = get_details_page(i, page, context)
-
-                    filed_dt = (
-                        details_page.locator(
-                            "div.field--name-field-filed-date .field__item"
-                        )
-                        .inner_text()
-                        .strip()
+async def search_async(
+    rfq_no: str,
+    yday: Days,
+    session: AsyncBrowserSession,
+    limit: asyncio.Semaphore,
+) -> tuple[list[Protest], str]:
+    # Execute gao search on the asyncio engine
+
+    url = search_url(rfq_no)
+
+    async with limit:
+        with timing.labels(rfq=rfq_no), timing.span("search"):
+            if session.http is not None:
+                diff = session.diff(rfq_no)
+
+                try:
+                    protest_details = await asyncio.to_thread(
+                        scrape_http, session.http, url, yday, diff
                     )
+                except BotChallenge as e:
+                    metrics.inc("failures", stage="http")
+                    log.warning(f"{e}, falling back to browser")
+                else:
+                    if diff is not None:
+                        pending_snapshots.stage(diff)
+
+                    return protest_details, url
+
+            context = await session.new_context()
+            details_pool = session.details_pool(context)
+            diff = session.diff(rfq_no)
+
+            try:
+                protest_details = await scrape_results_async(
+                    context, url, yday, details_pool, diff
+                )
+            finally:
+                await details_pool.close()
+                await context.close()
+
+            if diff is not None:
+                pending_snapshots.stage(diff)
+
+            return protest_details, url
+
+
+async def search_stream(
+    rfq_pairs: list[tuple[str, str]], yday: Days, options: RunOptions
+):
+    # Run searches concurrently, yielding (rfq_no, search) as each completes
+    limit = asyncio.Semaphore(options.concurrency)
+
+    async with AsyncBrowserSession(options) as session:
+
+        async def run(rfq_no: str) -> tuple[str, tuple[list[Protest], str]]:
+            return rfq_no, await search_async(rfq_no, yday, session, limit)
 
-                    if filed_dt == yday:
-                        log.info("Opened protest")
-                        protest_info["company"] = (
-                            page.locator("div.teaser-search--heading h4.heading")
-                            .nth(i)
-                            .inner_text()
-                            .split(" (")[0]
-                            .strip()
-                        )
-                        protest_info["status"] = (
-                            page.locator("div.teaser-search--status .field__item")
-                            .nth(i)
-                            .inner_text()
-                            .strip()
-                        )
-                        protest_info["type"] = (
-                            details_page.locator(
-                                "div.field--name-field-case-type .field__item"
-                            )
-                            .inner_text()
-                            .strip()
-                        )
-
-                        if protest_info["status"] == "Case Currently Open":
-                            protest_info["status"] = "Opened"
-
-                        protest_info["filed_dt"] = filed_dt
-                        protest_info["due_dt"] = (
-                            details_page.locator(
-                                "div.field--name-field-due-date .field__item"
-                            )
-                            .inner_text()
-                            .strip()
-                        )
-
-                        protest_details.append(protest_info)
-
-        browser.close()
-
-        return protest_details, url
+        tasks = [asyncio.create_task(run(rfq_no)) for rfq_no, _ in rfq_pairs]
+
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            # Consumer stopped early or a search raised
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def iter_async(agen):
+    # Drive an async generator from sync code on a private event loop
+    loop = asyncio.new_event_loop()
+
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
 
 
 def build_textblock(content: str) -> dict:
     # Build TextBlock for MS Teams
-    return {"type": "TextBlock", "text": content, "wrap": True}
+    return render.textblock(content)
 
 
-def format_results(raw_results: list[dict]) -> list:
-    # Format results strings
+def format_results(
+    raw_results: list[RfqResult | dict], day: date | None = None
+) -> list:
+    # Format results strings, headed by day or today
+    return render.AdaptiveCardRenderer().items(list(map(as_result, raw_results)), day)
 
-    items = []
 
-    if raw_results:
-        header = f'**{date.today().strftime("%A, %m/%d/%Y")}.** Protest updates.'
-        items += [build_textblock(header), build_textblock("")]
+def group_by_day(
+    raw_results: list[RfqResult | dict], days: list[date], first: int = 1
+) -> list[tuple[date, list[RfqResult]]]:
+    # Split results into per-day results indexed from first, oldest day first
+    by_label = {gao_date(day): day for day in days}
+    grouped = {day: [] for day in days}
 
-        for result in raw_results:
+    for result in map(as_result, raw_results):
+        buckets = {}
+
+        for detail in result.protest_details:
+            # Store changes outside the range are reported on the last day
+            day = by_label.get(detail.day, days[-1])
+            buckets.setdefault(day, []).append(detail)
 
-            content = f'**{result["index"]}. {result["rfq_nm"]}** - {result["rfq_no"]} - [View on GAO]({result["url"]})'
+        for day, details in buckets.items():
+            grouped[day].append(replace(result, protest_details=details))
 
-            for detail in result["protest_details"]:
+    for results in grouped.values():
 
-                if "decided_dt" in detail:
-                    # Case closed
-                    content += f'\n\n- {detail["company"]} **|** {detail["type"]} {detail["status"]} **|** Decided {detail["decided_dt"]}'
+        for n, result in enumerate(results, first):
+            result.index = n
 
-                    if "decision_url" in detail:
-                        # Decision report published
-                        content += f' **|** [View decision](https://www.gao.gov{detail["decision_url"]})'
+    return [(day, results) for day, results in grouped.items() if results]
 
-                elif "filed_dt" in detail:
-                    # Case opened
-                    content += f'\n\n- {detail["company"]} **|** {detail["type"]} Opened **|** Filed {detail["filed_dt"]} **|** Due {detail["due_dt"]}'
 
-            items += [build_textblock(content), build_textblock("")]
+def read_last_run(path: str) -> date | None:
+    # Last day covered by a successful run, None before the first
+    try:
+        with open(path) as f:
+            return date.fromisoformat(json.load(f)["last_day"])
+    except FileNotFoundError:
+        return None
 
-    return items
 
+def write_last_run(path: str, day: date) -> None:
+    with open(path, "w") as f:
+        json.dump({"last_day": day.isoformat()}, f)
 
-def process_search(rfq_list: str) -> list:
-    # Prepare gao search and format results
+
+def run_days(options: RunOptions) -> list[date]:
+    # Days a run reports on, yesterday unless a backfill range is set
+    end = options.end_date or (datetime.now() - timedelta(days=1)).date()
+    start = options.start_date or end
+
+    if options.start_date is None and options.since_last_run:
+        last_day = read_last_run(options.since_last_run)
+
+        if last_day is not None:
+            start = last_day + timedelta(days=1)
+
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+def parse_rfq_list(rfq_list: str) -> list[tuple[str, str]]:
+    # Split rfq_list into (rfq_no, rfq_nm) pairs
     rfq_pairs = []
-    raw_results = []
-    yday = (datetime.now() - timedelta(days=1)).strftime("%b %-d, %Y")
-    log.info(f"Yesterday: {yday}")
 
     if rfq_list:
-        rfq_pairs = rfq_list.split(",")
 
-    for pair in rfq_pairs:
-        log.info("Processing rfq number search")
+        for pair in rfq_list.split(","):
+            rfq_no, rfq_nm = pair.split(":", 1)
+            rfq_pairs.append((rfq_no.strip(), rfq_nm.strip()))
 
-        rfq_no, rfq_nm = pair.split(":", 1)
-        rfq_no = rfq_no.strip()
-        rfq_nm = rfq_nm.strip()
-        protest_details, url = search(rfq_no, yday)
+    return rfq_pairs
 
-        if protest_details:
-            raw_results.append(
-                {
-                    "rfq_no": rfq_no,
-                    "rfq_nm": rfq_nm,
-                    "protest_details": protest_details,
-                    "url": url,
-                }
+
+def parse_shard(value: str) -> tuple[int, int]:
+    # Parse an i/n shard spec, 1 <= i <= n
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got {value!r}")
+
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {value!r} out of range")
+
+    return index, count
+
+
+def shard_of(rfq_no: str, count: int) -> int:
+    # Stable 1-based shard of a solicitation, the same on every process and runner
+    digest = hashlib.sha1(normalize_solicitation(rfq_no).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def shard_pairs(
+    rfq_pairs: list[tuple[str, str]], index: int, count: int
+) -> list[tuple[str, str]]:
+    # The rfq_pairs of shard index of count, in list order
+    return [pair for pair in rfq_pairs if shard_of(pair[0], count) == index]
+
+
+def iter_searches(rfq_pairs: list[tuple[str, str]], options: RunOptions, days: list[date]):
+    # Search rfq_pairs for days, yielding (rfq_no, search) as each completes
+    day = days[0]
+
+    if len(days) == 1:
+        yday = gao_date(day)
+        log.info(f"Yesterday: {yday}")
+    else:
+        yday = frozenset(gao_date(d) for d in days)
+        log.info(f"Backfill: {gao_date(day)} to {gao_date(days[-1])}")
+
+    metrics.inc("rfqs_searched", len(rfq_pairs))
+
+    with throttle.configured(
+        options.rate_limit,
+        options.rate_burst,
+        options.concurrency,
+        options.latency_target,
+    ):
+        if options.feed and rfq_pairs:
+            log.info(f"Matching daily feed against {len(rfq_pairs)} rfq numbers")
+
+            with BrowserSession(options) as session, timing.span("feed"):
+                searches = feed_search(rfq_pairs, day, yday, session, days[-1])
+
+            yield from zip((rfq_no for rfq_no, _ in rfq_pairs), searches)
+        elif options.concurrency > 1 and rfq_pairs:
+            log.info(
+                f"Processing {len(rfq_pairs)} rfq number searches, "
+                f"{options.concurrency} at a time"
             )
+            yield from iter_async(search_stream(rfq_pairs, yday, options))
+        else:
+
+            with BrowserSession(options) as session:
+
+                for rfq_no, _ in rfq_pairs:
+                    log.info("Processing rfq number search")
+
+                    with timing.labels(rfq=rfq_no), timing.span("search"):
+                        result = search(rfq_no, yday, session)
+
+                    yield rfq_no, result
+
+
+def search_results(
+    rfq_pairs: list[tuple[str, str]],
+    options: RunOptions,
+    days: list[date],
+    journal: Journal | None = None,
+) -> list[RfqResult]:
+    # Raw results of searching rfq_pairs for days, in rfq_pairs order,
+    # each solicitation checkpointed to journal as it completes
+    searches = {}
+
+    for rfq_no, result in iter_searches(rfq_pairs, options, days):
+
+        if journal is not None:
+            journal.record(rfq_no, result, pending_snapshots.get(rfq_no))
+
+        searches[rfq_no] = result
+
+    raw_results = []
+
+    for rfq_no, rfq_nm in rfq_pairs:
+        protest_details, url = searches[rfq_no]
+
+        if protest_details:
+            raw_results.append(RfqResult(rfq_no, rfq_nm, protest_details, url))
+
+    return raw_results
+
+
+def shard_worker(
+    rfq_pairs: list[tuple[str, str]],
+    options: RunOptions,
+    days: list[date],
+    gao_url: str | None = None,
+) -> tuple[list[RfqResult], list[dict], dict, dict]:
+    # Search one shard in a worker process with its own browser, against
+    # the parent's gao_url, which a freshly imported search does not have
+    global GAO_URL
+
+    if gao_url is not None:
+        GAO_URL = gao_url
+
+    timing.recorder.reset()
+    metrics.counters.reset()
+    pending_snapshots.reset()
+
+    if options.journal_path:
+        # Workers append to the run's journal, already started by the parent
+        with Journal(options.journal_path, days) as journal:
+            raw_results = search_results(rfq_pairs, options, days, journal)
+    else:
+        raw_results = search_results(rfq_pairs, options, days)
+
+    return raw_results, timing.recorder.spans, metrics.counters.values, pending_snapshots.values
+
+
+def worker_pairs(
+    rfq_pairs: list[tuple[str, str]], workers: int
+) -> list[list[tuple[str, str]]]:
+    # Deal rfq_pairs round-robin to workers; not by shard_of, which would
+    # leave workers idle on a --shard whose count shares a factor with them
+    return [rfq_pairs[i::workers] for i in range(workers)]
+
+
+def iter_pool(rfq_pairs: list[tuple[str, str]], options: RunOptions, days: list[date]):
+    # Search rfq_pairs on a pool of worker processes, one shard each,
+    # yielding each shard's raw results as it finishes
+    workers = options.workers
+    shards = worker_pairs(rfq_pairs, workers)
+    log.info(f"Processing {len(rfq_pairs)} rfq numbers on {workers} worker processes")
+
+    # Workers share the politeness budget of one run
+    worker_options = replace(
+        options,
+        workers=1,
+        shard=None,
+        rate_limit=options.rate_limit / workers,
+        rate_burst=max(options.rate_burst // workers, 1),
+    )
+
+    # Spawned, not forked, so no worker inherits threads or browser state
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = [
+            pool.submit(shard_worker, pairs, worker_options, days, GAO_URL)
+            for pairs in shards
+            if pairs
+        ]
+
+        for future in as_completed(futures):
+            raw_results, spans, counter_values, snapshots = future.result()
+            timing.recorder.extend(spans)
+            metrics.counters.merge(counter_values)
+            # Saved by the parent once posted
+            pending_snapshots.merge(snapshots)
+            yield raw_results
+
+
+def pool_results(
+    rfq_pairs: list[tuple[str, str]], options: RunOptions, days: list[date]
+) -> list[RfqResult]:
+    # Raw results searched by a pool of worker processes, in rfq_pairs order
+    return merge_results(rfq_pairs, list(iter_pool(rfq_pairs, options, days)))
+
+
+def merge_results(
+    rfq_pairs: list[tuple[str, str]], shard_results: list[list[RfqResult]]
+) -> list[RfqResult]:
+    # Merge per-shard raw results in rfq_pairs order, first result per rfq_no wins
+    order = {rfq_no: n for n, (rfq_no, _) in enumerate(rfq_pairs)}
+    merged = {}
+
+    for raw_results in shard_results:
+
+        for result in raw_results:
+            merged.setdefault(result.rfq_no, result)
+
+    return sorted(
+        merged.values(),
+        key=lambda result: (order.get(result.rfq_no, len(order)), result.rfq_no),
+    )
+
+
+def write_shard(
+    path: str, days: list[date], raw_results: list[RfqResult], snapshots: dict | None = None
+) -> None:
+    # Save a shard's raw results, and store snapshots staged for them, for a later --merge run
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "days": [day.isoformat() for day in days],
+                "results": [result.to_dict() for result in raw_results],
+                "snapshots": snapshots or {},
+            },
+            f,
+            indent=2,
+        )
+
+
+def read_shards(
+    rfq_pairs: list[tuple[str, str]], paths: list[str]
+) -> tuple[list[date], list[RfqResult]]:
+    # Days and merged raw results of shard files written by write_shard
+    days = set()
+    shard_results = []
+
+    for path in paths:
+        with open(path) as f:
+            shard = json.load(f)
+
+        days.update(date.fromisoformat(day) for day in shard["days"])
+        shard_results.append([RfqResult.from_dict(result) for result in shard["results"]])
+        # Saved to the merge run's store once posted
+        pending_snapshots.merge(shard.get("snapshots", {}))
+
+    return sorted(days), merge_results(rfq_pairs, shard_results)
+
+
+def run_sections(
+    raw_results: list[RfqResult], days: list[date], first: int = 1
+) -> list[tuple[date | None, list[RfqResult]]]:
+    # Index raw results from first, one section per day for a backfill
+    raw_results = [as_result(result) for result in raw_results]
 
     if raw_results:
         # Inject index into results
-        n = 1
+        n = first
 
         for result in raw_results:
-            result["index"] = n
+            result.index = n
             n += 1
 
-    return format_results(raw_results)
+    if len(days) > 1:
+        return group_by_day(raw_results, days, first)
+
+    return [(None, raw_results)]
+
+
+def format_run(raw_results: list[RfqResult], days: list[date], first: int = 1) -> list:
+    # Index raw results from first and format them, one section per day for a backfill
+    with timing.span("format_results"):
+        items = []
 
+        for result_day, results in run_sections(raw_results, days, first):
+            items += format_results(results, result_day)
+
+        return items
+
+
+def write_output(raw_results: list[RfqResult], days: list[date], options: RunOptions) -> None:
+    # Render the run's results to options.output_path, if set
+    if options.output_path:
+        with timing.span("render"):
+            render.write_path(
+                options.output_path, options.output_format, run_sections(raw_results, days)
+            )
+
+        log.info(f"Results written to {options.output_path} as {options.output_format}")
+
+
+def process_search(rfq_list: str, options: RunOptions | None = None) -> list:
+    # Prepare gao search and format results
+    options = options or RunOptions()
+    rfq_pairs = parse_rfq_list(rfq_list)
+
+    if options.merge_paths:
+        days, raw_results = read_shards(rfq_pairs, list(options.merge_paths))
+        log.info(f"Merged {len(options.merge_paths)} shard result files")
+        write_output(raw_results, days, options)
+
+        return format_run(raw_results, days)
+
+    days = run_days(options)
+
+    if not days:
+        log.info("No days to search since the last run")
+        return []
+
+    if options.shard is not None:
+        rfq_pairs = shard_pairs(rfq_pairs, *options.shard)
+        log.info(f"Shard {options.shard[0]}/{options.shard[1]}: {len(rfq_pairs)} rfq numbers")
+
+    if options.journal_path:
+        with Journal(options.journal_path, days) as journal:
+            pending = journal.pending(rfq_pairs)
+
+            if len(pending) < len(rfq_pairs):
+                log.info(
+                    f"Journal: resuming, {len(rfq_pairs) - len(pending)} of "
+                    f"{len(rfq_pairs)} rfq numbers already searched"
+                )
+
+            if options.workers > 1 and len(pending) > 1:
+                pool_results(pending, options, days)
+            else:
+                search_results(pending, options, days, journal)
+
+            raw_results = journal.results(rfq_pairs)
+            # Snapshots of solicitations searched before a restart
+            pending_snapshots.merge(journal.snapshots)
+    elif options.workers > 1 and len(rfq_pairs) > 1:
+        raw_results = pool_results(rfq_pairs, options, days)
+    else:
+        raw_results = search_results(rfq_pairs, options, days)
+
+    if options.results_out:
+        # Posted, and its snapshots saved, by a later --merge run
+        write_shard(options.results_out, days, raw_results, pending_snapshots.take())
+        log.info(f"Shard results written to {options.results_out}")
+
+        return []
+
+    write_output(raw_results, days, options)
+
+    return format_run(raw_results, days)
+
+
+def stream_search(
+    rfq_list: str, options: RunOptions | None = None, journal: Journal | None = None
+):
+    # Yield raw results as searches complete, updates or not, skipping
+    # solicitations already in journal; with workers, per finished shard
+    options = options or RunOptions()
+    rfq_pairs = parse_rfq_list(rfq_list)
+    days = run_days(options)
+
+    if not days:
+        log.info("No days to search since the last run")
+        return
+
+    if options.shard is not None:
+        rfq_pairs = shard_pairs(rfq_pairs, *options.shard)
+        log.info(f"Shard {options.shard[0]}/{options.shard[1]}: {len(rfq_pairs)} rfq numbers")
+
+    if journal is not None:
+        pending = journal.pending(rfq_pairs)
+
+        if len(pending) < len(rfq_pairs):
+            log.info(
+                f"Journal: resuming, {len(rfq_pairs) - len(pending)} of "
+                f"{len(rfq_pairs)} rfq numbers already posted"
+            )
+
+        rfq_pairs = pending
+
+    if options.workers > 1 and len(rfq_pairs) > 1:
+        # Checkpointed once posted, not by the workers
+        for raw_results in iter_pool(rfq_pairs, replace(options, journal_path=None), days):
+            yield from raw_results
+    else:
+        names = dict(rfq_pairs)
+
+        for rfq_no, (protest_details, url) in iter_searches(rfq_pairs, options, days):
+            yield RfqResult(rfq_no, names[rfq_no], protest_details, url)
+
+
+class TeamsSink:
+    """Posts streamed results to MS Teams in micro-batches.
+
+    A batch is posted once it holds max_results solicitations with
+    updates, or max_seconds after its first one arrived, whichever comes
+    first; close() posts the rest and waits for every post. Posts run in
+    order on one background thread, so add() never blocks the searches
+    on a post. Numbering continues across batches, from the count of
+    solicitations queued before, and on_posted is called on the posting
+    thread with each batch once it is posted, and with results that had
+    nothing to post.
+    """
+
+    def __init__(
+        self,
+        api_client: client.ApiClient,
+        days: list[date],
+        max_results: int = 5,
+        max_seconds: float = 5.0,
+        on_posted=None,
+        max_bytes: int = cards.MAX_BYTES,
+    ) -> None:
+        self.api_client = api_client
+        self.days = days
+        self.max_results = max(max_results, 1)
+        self.max_seconds = max_seconds
+        self.on_posted = on_posted
+        self.max_bytes = max_bytes
+        self.pending = []
+        self.queued = 0
+        self.posted = 0
+        self.batches = 0
+        self._lock = threading.RLock()
+        self._timer = None
+        self._error = None
+        self._poster = ThreadPoolExecutor(max_workers=1, thread_name_prefix="teams-post")
+        self._posts = []
+
+    def __enter__(self) -> "TeamsSink":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Unposted results are not checkpointed, a rerun searches them again
+            self._cancel()
+            self._poster.shutdown(cancel_futures=True)
+
+    def _raise_error(self) -> None:
+        # Surface a failed background post on the caller's thread
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _expire(self, batch: int) -> None:
+        # Timer callback, queues the batch if it is still pending
+        with self._lock:
+            if self.batches != batch or not self.pending:
+                return
+
+            self._queue()
+
+    def _submit(self, fn, *args) -> None:
+        # Run fn on the posting thread, keeping its first error for the caller
+        def run() -> None:
+            try:
+                fn(*args)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+
+        self._posts.append(self._poster.submit(run))
+
+    def _queue(self) -> None:
+        # Queue pending results for posting as one message
+        with self._lock:
+            self._cancel()
+
+            if not self.pending:
+                return
+
+            batch, self.pending = self.pending, []
+            self.batches += 1
+            self._submit(self._post, batch, self.queued + 1, self.batches)
+            self.queued += len(batch)
+
+    def _post(self, batch: list[RfqResult], first: int, number: int) -> None:
+        log.info(f"Posting batch {number} of {len(batch)} rfq numbers")
+        teams_post(self.api_client, format_run(batch, self.days, first), self.max_bytes)
+
+        with self._lock:
+            self.posted += len(batch)
+
+        if self.on_posted is not None:
+            self.on_posted(batch)
+
+    def add(self, result: RfqResult) -> None:
+        self._raise_error()
+
+        with self._lock:
+            if not result.protest_details:
+                if self.on_posted is not None:
+                    # After the batches queued before it, like a post
+                    self._submit(self.on_posted, [result])
+
+                return
+
+            self.pending.append(result)
+
+            if len(self.pending) >= self.max_results:
+                self._queue()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_seconds, self._expire, (self.batches,))
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        # Post pending results as one message and wait for every queued post
+        with self._lock:
+            self._queue()
+            posts, self._posts = self._posts, []
+
+        for post in posts:
+            post.result()
+
+    def close(self) -> None:
+        self.flush()
+        self._poster.shutdown()
+        self._raise_error()
+
+
+def gao_config(options: RunOptions) -> client.Configuration:
+    # A kept-alive gao connection for each search the run makes at once
+    api_config = client.Configuration()
+    api_config.connection_pool_maxsize = max(options.concurrency, 1)
+    return api_config
+
+
+def teams_config(ms_webhook_url: str) -> client.Configuration:
+    api_config = client.Configuration()
+    api_config.host = ms_webhook_url
+    return api_config
+
+
+def teams_client(ms_webhook_url: str) -> client.ApiClient:
+    return client.ApiClient(teams_config(ms_webhook_url))
+
+
+def stream_post(rfq_list: str, ms_webhook_url: str, options: RunOptions) -> int:
+    # Search and post updates in micro-batches as solicitations complete,
+    # returns the number of solicitations posted
+    days = run_days(options)
+    api_client = teams_client(ms_webhook_url)
+
+    with (
+        Journal(options.journal_path, days) if options.journal_path and days else nullcontext()
+    ) as journal:
+
+        def on_posted(results: list[RfqResult]) -> None:
+            if options.store_path:
+                pending_snapshots.commit(options.store_path, [result.rfq_no for result in results])
+
+            if journal is not None:
+
+                for result in results:
+                    journal.record(result.rfq_no, (result.protest_details, result.url))
+
+        with TeamsSink(
+            api_client,
+            days,
+            options.batch_size,
+            options.batch_seconds,
+            on_posted,
+            options.card_bytes,
+        ) as sink:
+
+            for result in stream_search(rfq_list, options, journal):
+                sink.add(result)
+
+    return sink.posted
+
+
+def teams_post(
+    api_client: client.ApiClient, items: list[dict], max_bytes: int = cards.MAX_BYTES
+) -> None:
+    # Execute MS Teams posts, items packed into as few messages as fit max_bytes
+    from client.rest import ApiException
 
-def teams_post(api_client: client.ApiClient, items: list[dict]) -> None:
-    # Execute MS Teams post
     api_instance = client.MsApi(api_client)
+    messages = cards.pack(items, max_bytes, api_client.encode_json)
 
-    try:
-        api_instance.teams_post(
-            body={
-                "type": "message",
-                "attachments": [
-                    {
-                        "contentType": "application/vnd.microsoft.card.adaptive",
-                        "content": {
-                            "type": "AdaptiveCard",
-                            "version": "1.0",
-                            "body": [{"type": "Container", "items": items}],
-                            "msteams": {"width": "Full"},
-                        },
-                    }
-                ],
-            }
-        )
+    if len(messages) > 1:
+        log.info(f"Splitting post into {len(messages)} messages of at most {max_bytes} bytes")
+
+    for message in messages:
+        body = cards.message_body(message)
+        metrics.inc("teams_post_bytes", cards.size(body, api_client.encode_json))
+
+        try:
+            with timing.span("teams_post"):
+                api_instance.teams_post(body=body)
+
+        except ApiException as e:
+            metrics.inc("failures", stage="teams_post")
+            log.exception("Exception when calling MsApi->teams_post: %s\n" % e)
+            raise
 
-    except ApiException as e:
-        log.exception("Exception when calling MsApi->teams_post: %s\n" % e)
-        raise
 
+def run_report_path(options: RunOptions) -> str | None:
+    # Report path, next to the log file unless set explicitly
+    if options.report_path:
+        return options.report_path
 
-def main(rfq_list: str, ms_webhook_url: str) -> None:
+    if options.log_file:
+        return str(Path(options.log_file).with_suffix(".report.json"))
+
+    return None
+
+
+def main(
+    rfq_list: str, ms_webhook_url: str, options: RunOptions | None = None
+) -> None:
     # Primary processing fuction
+    options = options or RunOptions()
+    started = datetime.now()
+    handler = None
+    days = run_days(options)
+
+    if days:
+        # Fix the range once, so the state recorded matches what was searched
+        options = replace(options, start_date=days[0], end_date=days[-1])
+
+    success = False
+    timing.recorder.reset()
+    metrics.counters.reset()
+    pending_snapshots.reset()
+
+    if options.log_file:
+        handler = logging.FileHandler(options.log_file)
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+        logging.getLogger().addHandler(handler)
+
+    try:
+        with timing.span("run"):
+            log.info("Start processing")
+
+            if options.warmup:
+                pools.registry.warmup(teams_config(ms_webhook_url), ms_webhook_url)
+
+            if options.stream and not (options.results_out or options.merge_paths):
+                if not stream_post(rfq_list, ms_webhook_url, options):
+                    log.info("No protest updates found")
+            else:
+                protest_results = process_search(rfq_list, options)
+
+                if protest_results:
+                    log.info("Process Teams posts")
+                    teams_post(
+                        teams_client(ms_webhook_url), protest_results, options.card_bytes
+                    )
+                else:
+                    log.info("No protest updates found")
 
-    log.info("Start processing")
-    protest_results = process_search(rfq_list)
+                if options.store_path:
+                    # Only once posted, a failed post is reported again by the rerun
+                    pending_snapshots.commit(options.store_path)
 
-    if protest_results:
-        log.info("Process Teams posts")
-        api_config = client.Configuration()
-        api_config.host = ms_webhook_url
-        api_client = client.ApiClient(api_config)
-        teams_post(api_client, protest_results)
-    else:
-        log.info("No protest updates found")
+        success = True
+
+        if options.since_last_run and days:
+            write_last_run(options.since_last_run, days[-1])
+
+        if options.journal_path:
+            # Posted, a rerun starts over
+            remove_journal(options.journal_path)
+    except Exception:
+        metrics.inc("failures", stage="run")
+        raise
+    finally:
+        report_path = run_report_path(options)
+
+        if report_path:
+            timing.recorder.write_report(
+                report_path,
+                started=started.isoformat(timespec="seconds"),
+                options=asdict(options),
+                pools=pools.registry.stats(),
+            )
+            log.info(f"Run report written to {report_path}")
+
+        if options.metrics_path:
+            metrics.write_textfile(
+                options.metrics_path,
+                metrics.render(metrics.counters, timing.recorder, success, time.time()),
+            )
+            log.info(f"Metrics written to {options.metrics_path}")
+
+        if handler is not None:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+
+
+def parse_args(argv: list[str]) -> tuple[str, str, RunOptions]:
+    # Parse command line into rfq_list, ms_webhook_url and run options
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rfq_list", help="comma separated rfq_no:rfq_nm pairs")
+    parser.add_argument("ms_webhook_url", help="MS Teams webhook url")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=RunOptions.concurrency,
+        help="solicitations searched at once on the asyncio engine",
+    )
+    parser.add_argument(
+        "--details-pool-size",
+        type=int,
+        default=RunOptions.details_pool_size,
+        help="details tabs kept open per solicitation",
+    )
+    parser.add_argument(
+        "--details-max-uses",
+        type=int,
+        default=RunOptions.details_max_uses,
+        help="visits before a details tab is closed and replaced",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["playwright", "http"],
+        default=RunOptions.backend,
+        help="http reads gao pages without a browser, falling back to playwright",
+    )
+    parser.add_argument(
+        "--no-block",
+        dest="block_resources",
+        action="store_false",
+        help="load images, fonts, media and trackers during navigation",
+    )
+    parser.add_argument(
+        "--block-types",
+        default=",".join(RunOptions.block_types),
+        help="comma separated resource types aborted during navigation, add "
+        "stylesheet to also skip CSS at the cost of CSS-hidden fields reading as visible",
+    )
+    parser.add_argument(
+        "--allow",
+        action="append",
+        default=[],
+        help="host or url substring never blocked, may be repeated",
+    )
+    parser.add_argument(
+        "--feed",
+        action="store_true",
+        help="list the day's gao protests once and match them against rfq_list",
+    )
+    parser.add_argument(
+        "--store",
+        dest="store_path",
+        help="sqlite snapshot file, report only protests new or changed since the last run",
+    )
+    parser.add_argument(
+        "--log-file",
+        help="also write the log to this file, with the run report next to it",
+    )
+    parser.add_argument(
+        "--report",
+        dest="report_path",
+        help="per-stage timing report path, defaults to <log-file>.report.json",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=RunOptions.rate_limit,
+        help="gao navigations per second across the run, 0 disables the limit",
+    )
+    parser.add_argument(
+        "--rate-burst",
+        type=int,
+        default=RunOptions.rate_burst,
+        help="gao navigations allowed back to back before the rate limit applies",
+    )
+    parser.add_argument(
+        "--latency-target",
+        type=float,
+        default=RunOptions.latency_target,
+        help="navigation seconds above which concurrency stops growing",
+    )
+    parser.add_argument(
+        "--start",
+        dest="start_date",
+        type=date.fromisoformat,
+        help="backfill from this YYYY-MM-DD date, grouping results per day",
+    )
+    parser.add_argument(
+        "--end",
+        dest="end_date",
+        type=date.fromisoformat,
+        help="last YYYY-MM-DD date searched, defaults to yesterday",
+    )
+    parser.add_argument(
+        "--since-last-run",
+        help="state file recording the last day searched, backfills from the day after",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        help="search only shard i of n (1-based) of rfq_list, e.g. 2/4",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=RunOptions.workers,
+        help="worker processes, each searching one shard with its own browser",
+    )
+    parser.add_argument(
+        "--results-out",
+        help="write raw shard results to this file instead of posting",
+    )
+    parser.add_argument(
+        "--merge",
+        dest="merge_paths",
+        nargs="+",
+        default=[],
+        help="merge these --results-out files and post them once instead of searching",
+    )
+    parser.add_argument(
+        "--journal",
+        dest="journal_path",
+        help="checkpoint file, a restarted run for the same days skips finished rfq numbers",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="post updates in micro-batches as solicitations complete",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=RunOptions.batch_size,
+        help="solicitations with updates per streamed post",
+    )
+    parser.add_argument(
+        "--batch-seconds",
+        type=float,
+        default=RunOptions.batch_seconds,
+        help="seconds a streamed update waits for its batch to fill",
+    )
+    parser.add_argument(
+        "--card-bytes",
+        type=int,
+        default=RunOptions.card_bytes,
+        help="serialized bytes per teams message, larger posts are split into numbered parts",
+    )
+    parser.add_argument(
+        "--output",
+        dest="output_path",
+        help="also write the run's results to this file",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=list(render.RENDERERS),
+        default=RunOptions.output_format,
+        help="format of the --output file",
+    )
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="connect to the webhook host while searching, so the post skips the handshake",
+    )
+    parser.add_argument(
+        "--metrics",
+        dest="metrics_path",
+        help="prometheus textfile written at the end of the run, e.g. for node-exporter",
+    )
+    args = parser.parse_args(argv)
+    options = RunOptions(
+        concurrency=args.concurrency,
+        details_pool_size=args.details_pool_size,
+        details_max_uses=args.details_max_uses,
+        backend=args.backend,
+        block_resources=args.block_resources,
+        block_types=tuple(t.strip() for t in args.block_types.split(",") if t.strip()),
+        block_allowlist=tuple(args.allow),
+        feed=args.feed,
+        store_path=args.store_path,
+        log_file=args.log_file,
+        report_path=args.report_path,
+        metrics_path=args.metrics_path,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        latency_target=args.latency_target,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        since_last_run=args.since_last_run,
+        shard=args.shard,
+        workers=args.workers,
+        results_out=args.results_out,
+        merge_paths=tuple(args.merge_paths),
+        journal_path=args.journal_path,
+        stream=args.stream,
+        batch_size=args.batch_size,
+        batch_seconds=args.batch_seconds,
+        card_bytes=args.card_bytes,
+        output_path=args.output_path,
+        output_format=args.output_format,
+        warmup=args.warmup,
+    )
+
+    return args.rfq_list, args.ms_webhook_url, options
 
 
-""" Read in rfq_list, ms_webhook_url
+""" Read in rfq_list, ms_webhook_url and run options
 """
 if __name__ == "__main__":
-    main(sys.argv[1], sys.argv[2])
+    main(*parse_args(sys.argv[1:]))
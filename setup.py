@@ -21,6 +21,7 @@ setup(
     url="",
     keywords=[],
     install_requires=REQUIRES,
+    extras_require={"async": ["aiohttp >= 3.8"]},
     packages=find_packages(),
     include_package_data=True,
     long_description=""
@@ -0,0 +1,241 @@
+"""
+    Local SQLite snapshot of every protest seen, keyed by B-number, used
+    to emit only protests that are new or changed since the last run.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+from records import Protest
+
+
+log = logging.getLogger("search")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS protests (
+    b_number TEXT PRIMARY KEY,
+    rfq_no TEXT NOT NULL,
+    company TEXT,
+    status TEXT,
+    decided_dt TEXT,
+    filed_dt TEXT,
+    due_dt TEXT,
+    type TEXT,
+    decision_url TEXT,
+    details_href TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS protests_rfq_no ON protests (rfq_no);
+"""
+
+UPSERT = """
+INSERT INTO protests (
+    b_number, rfq_no, company, status, decided_dt, filed_dt, due_dt, type,
+    decision_url, details_href, updated_at
+) VALUES (
+    :b_number, :rfq_no, :company, :status, :decided_dt, :filed_dt, :due_dt,
+    :type, :decision_url, :details_href, :updated_at
+)
+ON CONFLICT (b_number) DO UPDATE SET
+    rfq_no = excluded.rfq_no,
+    company = excluded.company,
+    status = excluded.status,
+    decided_dt = excluded.decided_dt,
+    filed_dt = COALESCE(excluded.filed_dt, protests.filed_dt),
+    due_dt = COALESCE(excluded.due_dt, protests.due_dt),
+    type = COALESCE(excluded.type, protests.type),
+    decision_url = excluded.decision_url,
+    details_href = excluded.details_href,
+    updated_at = excluded.updated_at
+"""
+
+
+def b_number(row: dict) -> str:
+    # GAO file number of a teaser row, from its heading or details link
+    match = re.search(r"\((B-[\d.]+)", row["heading"] or "")
+
+    if match:
+        return match.group(1)
+
+    return (row["details_href"] or "").rstrip("/").rsplit("/", 1)[-1].upper()
+
+
+def row_status(row: dict) -> str | None:
+    # Outcome of a closed protest or status of an open one
+    return row["outcome"] if row["outcome"] is not None else row["status"]
+
+
+class ProtestStore:
+    """SQLite snapshot of protests, safe to share across threads."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "ProtestStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, number: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM protests WHERE b_number = ?", (number,)
+            ).fetchone()
+
+        return dict(row) if row is not None else None
+
+    def rfq_of(self, row: dict) -> str | None:
+        # Solicitation a teaser row's protest was stored for, None when new
+        snapshot = self.get(b_number(row))
+        return snapshot["rfq_no"] if snapshot is not None else None
+
+    def has_rfq(self, rfq_no: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM protests WHERE rfq_no = ? LIMIT 1", (rfq_no,)
+            ).fetchone()
+
+        return row is not None
+
+    def upsert(self, snapshots: list[dict]) -> None:
+        # Write snapshots in one transaction
+        now = datetime.now().isoformat(timespec="seconds")
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                UPSERT, [dict(snapshot, updated_at=now) for snapshot in snapshots]
+            )
+
+    def diff(self, rfq_no: str) -> "SnapshotDiff":
+        return SnapshotDiff(self, rfq_no)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SnapshotDiff:
+    """Change detection for one solicitation's rows against the store.
+
+    The first time a solicitation is seen the store is seeded: rows are
+    recorded, but only the usual date rule decides what is reported.
+    """
+
+    def __init__(self, store: ProtestStore, rfq_no: str) -> None:
+        self.store = store
+        self.rfq_no = rfq_no
+        self.seeding = not store.has_rfq(rfq_no)
+        self.pending = []
+        self.skipped = 0
+
+    def unchanged(self, row: dict) -> bool:
+        # True when the stored snapshot matches the row
+        snapshot = self.store.get(b_number(row))
+
+        if (
+            snapshot is not None
+            and snapshot["status"] == row_status(row)
+            and snapshot["decided_dt"] == row["decision_date"]
+            and snapshot["decision_url"] == row["decision_link"]
+        ):
+            self.skipped += 1
+            return True
+
+        return False
+
+    def record(self, row: dict, protest_info: Protest | dict | None = None) -> None:
+        # Queue a snapshot of the row and, when fetched, its details
+        if isinstance(protest_info, Protest):
+            protest_info = protest_info.to_dict()
+
+        protest_info = protest_info or {}
+        self.pending.append(
+            {
+                "b_number": b_number(row),
+                "rfq_no": self.rfq_no,
+                "company": row["heading"].split(" (")[0].strip(),
+                "status": row_status(row),
+                "decided_dt": row["decision_date"],
+                "filed_dt": protest_info.get("filed_dt"),
+                "due_dt": protest_info.get("due_dt"),
+                "type": protest_info.get("type"),
+                "decision_url": row["decision_link"],
+                "details_href": row["details_href"],
+            }
+        )
+
+    def commit(self) -> None:
+        # Persist queued snapshots
+        if self.pending:
+            self.store.upsert(self.pending)
+
+        log.info(
+            f"Store: {len(self.pending)} protests new or changed, "
+            f"{self.skipped} unchanged for {self.rfq_no}"
+        )
+        self.pending = []
+
+
+class PendingSnapshots:
+    """Snapshots of a run's searches, held until its updates are posted.
+
+    Each finished search stages its SnapshotDiff per solicitation, and the
+    run commits them only once the Teams post succeeds: a failed post
+    leaves the store as it was, so the rerun reports the same updates.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.values = {}
+
+    def stage(self, diff: SnapshotDiff) -> None:
+        # Hold a finished search's snapshots, replacing any staged for its rfq_no
+        with self._lock:
+            self.values[diff.rfq_no] = diff.pending
+
+        log.info(
+            f"Store: {len(diff.pending)} protests new or changed, "
+            f"{diff.skipped} unchanged for {diff.rfq_no}"
+        )
+        diff.pending = []
+
+    def get(self, rfq_no: str) -> list[dict] | None:
+        with self._lock:
+            return self.values.get(rfq_no)
+
+    def merge(self, values: dict) -> None:
+        # Add snapshots staged elsewhere, e.g. by a worker process
+        with self._lock:
+            self.values.update(values)
+
+    def take(self, rfq_nos: list[str] | None = None) -> dict:
+        # Remove and return the snapshots staged for rfq_nos, or all
+        with self._lock:
+            keys = list(self.values) if rfq_nos is None else rfq_nos
+            return {key: self.values.pop(key) for key in keys if key in self.values}
+
+    def commit(self, path: str, rfq_nos: list[str] | None = None) -> None:
+        # Write the snapshots staged for rfq_nos, or all, to the store at path
+        taken = self.take(rfq_nos)
+        snapshots = [snapshot for values in taken.values() for snapshot in values]
+
+        if snapshots:
+            with ProtestStore(path) as protest_store:
+                protest_store.upsert(snapshots)
+
+        log.info(f"Store: saved {len(snapshots)} snapshots of {len(taken)} rfq numbers")
+
+    def reset(self) -> None:
+        with self._lock:
+            self.values = {}
+
+
+pending_snapshots = PendingSnapshots()
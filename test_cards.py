@@ -0,0 +1,80 @@
+"""
+    Tests for cards.py
+"""
+
+import cards
+import search
+
+
+def result_items(count: int, text_bytes: int = 400) -> list[dict]:
+    items = [
+        search.build_textblock("**Friday, 02/02/2024.** Protest updates."),
+        search.build_textblock(""),
+    ]
+
+    for n in range(1, count + 1):
+        items += [
+            search.build_textblock(f"**{n}. RFQ {n}** - {n}\n\n- " + "x" * text_bytes),
+            search.build_textblock(""),
+        ]
+
+    return items
+
+
+def test_pack_fits_one_message():
+    items = result_items(3)
+    assert [items] == cards.pack(items)
+
+
+def test_pack_splits_in_order_under_budget():
+    items = result_items(20)
+    messages = cards.pack(items, 3000)
+
+    assert 1 < len(messages)
+    assert [f"**Part {n} of {len(messages)}.**" for n in range(1, len(messages) + 1)] == [
+        message[0]["text"] for message in messages
+    ]
+    assert items == [item for message in messages for item in message[1:]]
+
+    for message in messages:
+        assert cards.size(cards.message_body(message)) <= 3000
+        # Every message ends on a block's spacer
+        assert "" == message[-1]["text"]
+
+
+def test_pack_posts_oversized_block_alone():
+    items = result_items(1, 800) + result_items(1, 4000)[2:]
+    messages = cards.pack(items, 2000)
+
+    assert 2 == len(messages)
+    assert 4000 < cards.size(cards.message_body(messages[1]))
+
+
+def test_teams_post_splits_messages(mocker):
+    items = result_items(20)
+    mock_teams_post = mocker.patch("search.client.MsApi.teams_post")
+    api_config = search.client.Configuration()
+    api_config.host = "https://www.example.com"
+
+    search.teams_post(search.client.ApiClient(api_config), items, 3000)
+
+    bodies = [call.kwargs["body"] for call in mock_teams_post.call_args_list]
+    assert len(cards.pack(items, 3000)) == len(bodies)
+    assert "**Part 1 of" in bodies[0]["attachments"][0]["content"]["body"][0]["items"][0]["text"]
+
+
+def test_sizes_match_bytes_sent(mocker):
+    api_config = search.client.Configuration()
+    api_config.host = "https://www.example.com"
+    api_client = search.client.ApiClient(api_config)
+    request = mocker.patch.object(api_client.rest_client.pool_manager, "request")
+    request.return_value.status = 200
+    request.return_value.data = b"1"
+    items = [dict(item, text=item["text"].replace("x", "–")) for item in result_items(20)]
+    search.metrics.counters.reset()
+
+    search.teams_post(api_client, items, 3000)
+
+    sent = [len(call.kwargs["body"]) for call in request.call_args_list]
+    assert sum(sent) == search.metrics.counters.get("teams_post_bytes")
+    assert max(sent) <= 3000
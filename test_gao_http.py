@@ -0,0 +1,282 @@
+"""
+    Tests for gao_http.py
+"""
+
+import asyncio
+import logging
+import pickle
+
+import pytest
+
+import client
+import gao_http
+import gao_stub
+import search
+from client import pools
+from client.rest import ApiException
+
+
+SEARCH_HTML = """
+<html><head><title>Bid Protest Decisions | U.S. GAO</title></head><body>
+<div class="view-content">
+  <div class="views-row">
+    <div class="teaser-search">
+      <div class="teaser-search--bookmark"><button>Bookmark</button></div>
+      <div class="teaser-search--heading">
+        <h4 class="heading"><a href="/products/b-422681.5">Test Company (B-422681.5)</a></h4>
+      </div>
+      <div class="teaser-search--outcome">
+        <div class="field__label">Outcome</div>
+        <div class="field__item">Sustained</div>
+      </div>
+      <div class="teaser-search--decision_date">
+        <div class="field__item">Feb 2, 2024</div>
+      </div>
+      <div class="teaser-search-decision"><a href=" /products/b-422681.5 ">View Decision</a></div>
+    </div>
+  </div>
+  <div class="views-row">
+    <div class="teaser-search">
+      <div class="teaser-search--bookmark"><button>Bookmark</button></div>
+      <div class="teaser-search--heading">
+        <h4 class="heading"><a href="/products/b-422999.1">Test Company2 &amp; Sons (B-422999.1)</a></h4>
+      </div>
+      <div class="teaser-search--status">
+        <div class="field__item">Case Currently Open</div>
+      </div>
+      <div class="teaser-search-decision" style="display: none"><a href="/x">View Decision</a></div>
+    </div>
+  </div>
+</div>
+</body></html>
+"""
+
+CSS_HIDDEN_HTML = """
+<html><body>
+<div class="view-content">
+  <div class="views-row">
+    <div class="teaser-search">
+      <div class="teaser-search--heading">
+        <h4 class="heading"><a href="/products/b-423100.1">Hidden Co (B-423100.1)</a></h4>
+      </div>
+      <div class="teaser-search--outcome display-none"><div class="field__item">Dismissed</div></div>
+      <div class="teaser-search--status"><div class="field__item">Case Currently Open</div></div>
+      <div class="teaser-search-decision element-invisible"><a href="/x">View Decision</a></div>
+    </div>
+  </div>
+</div>
+</body></html>
+"""
+
+STYLESHEET_HIDDEN_HTML = """
+<html><head><link rel="stylesheet" href="/themes/custom/gao/css/style.css"></head><body>
+<div class="view-content">
+  <div class="views-row">
+    <div class="teaser-search">
+      <div class="teaser-search--heading">
+        <h4 class="heading"><a href="/products/b-423101.1">Styled Co (B-423101.1)</a></h4>
+      </div>
+      <div class="teaser-search--outcome"><div class="field__item">Denied</div></div>
+      <div class="teaser-search--status is-closed"><div class="field__item">Case Currently Open</div></div>
+    </div>
+  </div>
+</div>
+</body></html>
+"""
+
+DETAILS_HTML = """
+<html><body>
+<div class="field field--name-field-case-type"><div class="field__item">Bid Protest</div></div>
+<div class="field field--name-field-filed-date"><div class="field__item"> Feb 2, 2024 </div></div>
+<div class="field field--name-field-due-date"><div class="field__item">May 2, 2024</div></div>
+<div class="field field--name-field-solicitation-number">
+  <div class="field__items"><div class="field__item">123456789</div><div class="field__item">W912-24-R-0001</div></div>
+</div>
+<p>Unclosed paragraph<br>
+</body></html>
+"""
+
+
+def test_parse_rows():
+    assert [
+        {
+            "heading": "Test Company (B-422681.5)",
+            "outcome": "Sustained",
+            "status": None,
+            "decision_date": "Feb 2, 2024",
+            "decision_link": "/products/b-422681.5",
+            "details_href": "/products/b-422681.5",
+        },
+        {
+            "heading": "Test Company2 & Sons (B-422999.1)",
+            "outcome": None,
+            "status": "Case Currently Open",
+            "decision_date": None,
+            "decision_link": None,
+            "details_href": "/products/b-422999.1",
+        },
+    ] == gao_http.parse_rows(SEARCH_HTML)
+
+
+def test_parse_rows_css_hidden():
+    assert [
+        {
+            "heading": "Hidden Co (B-423100.1)",
+            "outcome": None,
+            "status": "Case Currently Open",
+            "decision_date": None,
+            "decision_link": None,
+            "details_href": "/products/b-423100.1",
+        }
+    ] == gao_http.parse_rows(CSS_HIDDEN_HTML)
+
+    with pytest.raises(gao_http.UnclassifiedPage):
+        gao_http.parse_rows(STYLESHEET_HIDDEN_HTML)
+
+
+def test_search_falls_back_on_unclassified_page(mocker):
+    session = mocker.Mock()
+    session.diff.return_value = None
+    mocker.patch(
+        "search.scrape_http",
+        side_effect=gao_http.UnclassifiedPage("cannot tell which fields are shown"),
+    )
+    scrape_results = mocker.patch("search.scrape_results", return_value=[])
+
+    assert ([], search.search_url("123456789")) == search.search(
+        "123456789", "Feb 2, 2024", session
+    )
+    scrape_results.assert_called_once()
+
+
+def test_parse_details():
+    assert {
+        "type": "Bid Protest",
+        "filed_dt": "Feb 2, 2024",
+        "due_dt": "May 2, 2024",
+        "solicitations": ["123456789", "W912-24-R-0001"],
+    } == gao_http.parse_details(DETAILS_HTML)
+
+
+def test_next_page_from():
+    url = "https://www.gao.gov/legal/bid-protests/search?processed=1&outcome=all"
+    pager = '<nav class="pager"><ul><li class="pager__item pager__item--next"><a href="?processed=1&amp;outcome=all&amp;page=1">Next</a></li></ul></nav>'
+
+    assert gao_http.next_page_from(gao_http.parse_html(SEARCH_HTML), url) is None
+    assert (
+        "https://www.gao.gov/legal/bid-protests/search?processed=1&outcome=all&page=1"
+        == gao_http.next_page_from(gao_http.parse_html(pager), url)
+    )
+
+
+def test_normalize_solicitation():
+    assert "W91224R0001" == gao_http.normalize_solicitation(" w912-24-r-0001 ")
+
+
+def test_fetcher_bot_challenge(mocker):
+    fetcher = gao_http.HttpFetcher()
+    get = mocker.patch.object(fetcher.rest_client, "GET")
+
+    get.return_value.data = b"<html><title>Just a moment...</title></html>"
+    with pytest.raises(gao_http.BotChallenge):
+        fetcher.get("https://www.gao.gov/legal/bid-protests/search")
+
+    get.side_effect = ApiException(status=403, reason="Forbidden")
+    with pytest.raises(gao_http.BotChallenge):
+        fetcher.get("https://www.gao.gov/legal/bid-protests/search")
+
+
+def test_fetcher_sends_no_content_type(mocker):
+    fetcher = gao_http.HttpFetcher()
+    request = mocker.patch.object(fetcher.rest_client.pool_manager, "request")
+    request.return_value.status = 200
+    request.return_value.data = b"<html><title>Bid Protest Decisions</title></html>"
+
+    fetcher.get("https://www.gao.gov/legal/bid-protests/search")
+
+    assert "Content-Type" not in request.call_args.kwargs["headers"]
+
+
+def test_async_get_sends_no_content_type(mocker):
+    pytest.importorskip("aiohttp")
+    from client import async_rest
+
+    response = mocker.Mock(status=200, reason="OK")
+    response.read = mocker.AsyncMock(return_value=b"")
+    session = mocker.Mock(request=mocker.AsyncMock(return_value=response))
+    mocker.patch.object(async_rest.RESTClientObject, "session", session)
+
+    rest_client = async_rest.RESTClientObject(client.Configuration())
+    asyncio.run(rest_client.request("GET", "https://www.gao.gov/legal/bid-protests/search"))
+
+    assert "Content-Type" not in session.request.call_args.kwargs["headers"]
+
+
+def test_fetcher_shares_warmed_pool_with_api_client(caplog):
+    caplog.set_level(logging.INFO, logger="rest")
+    with gao_stub.GaoStubServer(gao_stub.GaoStub()) as server:
+        api_config = client.Configuration()
+        api_config.connection_pool_maxsize = 3
+        fetcher = gao_http.HttpFetcher(api_config)
+
+        api_client = client.ApiClient(api_config)
+        assert fetcher.rest_client.pool_manager is api_client.rest_client.pool_manager
+
+        pools.registry.warmup(api_config, f"{server.url}/webhook/secret-key").join()
+        fetcher.get(f"{server.url}/legal/bid-protests/search")
+        fetcher.get(f"{server.url}/legal/bid-protests/search")
+
+        stats = pools.registry.stats()
+
+    # The warmup HEAD opens the one connection both GETs reuse
+    assert {"requests": 3, "connections": 1, "reused": 2} == stats["hosts"][server.url]
+    # Only the origin is requested, never the secret path
+    assert {"/", "/legal/bid-protests/search"} == set(server.stub.requests)
+    assert "Warmed up connection to 127.0.0.1" in caplog.text
+    assert "secret-key" not in caplog.text
+
+
+def test_gao_pool_sized_from_concurrency():
+    with search.BrowserSession(search.RunOptions(backend="http", concurrency=6)) as session:
+        assert 6 == session.http.rest_client.pool_manager.connection_pool_kw["maxsize"]
+
+    assert 4 == pools.pool_maxsize(client.Configuration())
+
+
+def test_streaming_response_chunks_and_stream_to(tmp_path):
+    stub = gao_stub.GaoStub()
+
+    with gao_stub.GaoStubServer(stub) as server:
+        rest_client = client.ApiClient().rest_client
+        url = f"{server.url}/legal/bid-protests/search"
+        expected = stub.render_search({}).encode("utf-8")
+
+        r = rest_client.GET(url, _preload_content=False)
+        chunks = [bytes(chunk) for chunk in r.iter_chunks(chunk_size=256)]
+        assert expected == b"".join(chunks)
+        assert {256} == {len(chunk) for chunk in chunks[:-1]}
+
+        path = tmp_path / "search.html"
+        r = rest_client.GET(url, _preload_content=False)
+        assert len(expected) == r.stream_to(str(path))
+        assert expected == path.read_bytes()
+        assert [path] == list(tmp_path.iterdir())
+
+        with pytest.raises(ApiException) as e:
+            rest_client.GET(f"{server.url}/missing", _preload_content=False)
+
+        # The error body was read and its connection returned to the pool
+        rest_client.GET(url)
+        stats = pools.registry.stats()["hosts"][server.url]
+
+    assert 404 == e.value.status
+    assert b"Page not found" in e.value.body
+    assert {"requests": 4, "connections": 1, "reused": 3} == stats
+
+    unpickled = pickle.loads(pickle.dumps(e.value))
+    assert (404, "Not Found", e.value.body) == (
+        unpickled.status,
+        unpickled.reason,
+        unpickled.body,
+    )
+    assert "text/html; charset=utf-8" == unpickled.headers["Content-Type"]
@@ -0,0 +1,217 @@
+"""
+    Tests for gao_stub.py, running the scraper end to end offline
+"""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+
+import gao_http
+import gao_stub
+import search
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    stub = gao_stub.GaoStub(page_size=2)
+
+    with gao_stub.GaoStubServer(stub) as server:
+        monkeypatch.setattr(search, "GAO_URL", server.url)
+        yield server
+
+
+def test_process_search_offline(stub_server):
+    yday = (date.today() - timedelta(days=1)).strftime("%b %-d, %Y")
+    due = (date.today() + timedelta(days=99)).strftime("%b %-d, %Y")
+    rfq_list = "W912DY-24-R-0001:Army RFQ,000000000:Quiet RFQ,47QTCA-24-Q-0002:GSA RFQ"
+
+    items = search.process_search(rfq_list, search.RunOptions(backend="http"))
+
+    assert [
+        f"**1. Army RFQ** - W912DY-24-R-0001 - [View on GAO]({search.search_url('W912DY-24-R-0001')})"
+        f"\n\n- Test Company **|** Bid Protest Sustained **|** Decided {yday} **|** [View decision](https://www.gao.gov/products/b-422681.5)"
+        f"\n\n- Test Company2 **|** Bid Protest Opened **|** Filed {yday} **|** Due {due}",
+        "",
+        f"**2. GSA RFQ** - 47QTCA-24-Q-0002 - [View on GAO]({search.search_url('47QTCA-24-Q-0002')})"
+        f"\n\n- Dismissed Company **|** Bid Protest Dismissed **|** Decided {yday}"
+        f"\n\n- Cost Claim Company **|** Cost Opened **|** Filed {yday} **|** Due {due}",
+        "",
+    ] == [item["text"] for item in items[2:]]
+    # Army solicitation has four protests over two result pages
+    assert 2 + 1 + 1 == stub_server.stub.requests["/legal/bid-protests/search"]
+
+
+def test_feed_offline(stub_server):
+    items = search.process_search(
+        "W912DY-24-R-0001:Army RFQ,47qtca24q0003:GSA RFQ",
+        search.RunOptions(backend="http", feed=True),
+    )
+
+    assert ["Test Company", "Test Company2"] == [
+        line.split(" **|** ")[0].removeprefix("- ")
+        for line in items[2]["text"].split("\n\n")[1:]
+    ]
+    assert ["Dismissed Company"] == [
+        line.split(" **|** ")[0].removeprefix("- ")
+        for line in items[4]["text"].split("\n\n")[1:]
+    ]
+
+
+def test_feed_store_offline(stub_server, tmp_path):
+    rfq_list = "W912DY-24-R-0001:Army RFQ,47qtca24q0003:GSA RFQ"
+    options = search.RunOptions(
+        backend="http", feed=True, store_path=str(tmp_path / "protests.db")
+    )
+
+    # First run seeds the store and reports by date, saved once posted
+    assert search.process_search(rfq_list, options)
+    search.pending_snapshots.commit(options.store_path)
+    stub_server.stub.requests.clear()
+
+    assert [] == search.process_search(rfq_list, options)
+    # Stored rows are unchanged, their details pages are not fetched again
+    assert "/products/b-422681.5" not in stub_server.stub.requests
+    assert "/products/b-422999.1" not in stub_server.stub.requests
+
+
+def test_backfill_offline(stub_server):
+    today = date.today()
+    items = search.process_search(
+        "W912DY-24-R-0001:Army RFQ,47QTCA-24-Q-0002:GSA RFQ",
+        search.RunOptions(
+            backend="http",
+            rate_limit=0,
+            start_date=today - timedelta(days=30),
+            end_date=today - timedelta(days=1),
+        ),
+    )
+
+    headers = [item["text"] for item in items if "Protest updates." in item["text"]]
+    assert [
+        f'**{(today - timedelta(days=20)).strftime("%A, %m/%d/%Y")}.** Protest updates.',
+        f'**{(today - timedelta(days=1)).strftime("%A, %m/%d/%Y")}.** Protest updates.',
+    ] == headers
+    assert items[2]["text"].startswith("**1. Army RFQ**")
+    assert "Pending Company" in items[2]["text"]
+    assert items[-2]["text"].startswith("**2. GSA RFQ**")
+    # One pass over each solicitation's results for the whole range
+    assert 2 + 1 == stub_server.stub.requests["/legal/bid-protests/search"]
+
+
+def test_shards_merge_offline(stub_server, tmp_path):
+    rfq_list = "W912DY-24-R-0001:Army RFQ,000000000:Quiet RFQ,47QTCA-24-Q-0002:GSA RFQ"
+    expected = search.process_search(rfq_list, search.RunOptions(backend="http", rate_limit=0))
+    paths = []
+
+    for index in (1, 2, 3):
+        path = str(tmp_path / f"shard{index}.json")
+        options = search.RunOptions(
+            backend="http", rate_limit=0, shard=(index, 3), results_out=path
+        )
+        assert [] == search.process_search(rfq_list, options)
+        paths.append(path)
+
+    # Merged in rfq_list order whatever order the shards arrive in
+    merged = search.process_search(
+        rfq_list, search.RunOptions(merge_paths=tuple(reversed(paths)))
+    )
+    assert expected == merged
+
+
+def test_worker_pool_offline(stub_server, monkeypatch):
+    # Spawned workers import search afresh, GAO_URL is only set on the parent's module
+    monkeypatch.delenv("GAO_URL", raising=False)
+    rfq_list = "W912DY-24-R-0001:Army RFQ,000000000:Quiet RFQ,47QTCA-24-Q-0002:GSA RFQ"
+
+    expected = search.process_search(rfq_list, search.RunOptions(backend="http", rate_limit=0))
+    search.timing.recorder.reset()
+    items = search.process_search(
+        rfq_list, search.RunOptions(backend="http", rate_limit=0, workers=2)
+    )
+
+    assert expected == items
+    # Worker spans are merged into the parent recorder
+    assert 3 == search.timing.recorder.summary()["search"]["count"]
+
+
+def test_journal_resume_offline(stub_server, tmp_path, monkeypatch):
+    rfq_list = "W912DY-24-R-0001:Army RFQ,000000000:Quiet RFQ,47QTCA-24-Q-0002:GSA RFQ"
+    options = search.RunOptions(
+        backend="http", rate_limit=0, journal_path=str(tmp_path / "run.journal")
+    )
+    expected = search.process_search(rfq_list, search.RunOptions(backend="http", rate_limit=0))
+    search_one = search.search
+
+    def crash_on_gsa(rfq_no, yday, session=None):
+        if rfq_no.startswith("47QTCA"):
+            raise Exception("Chromium crashed")
+
+        return search_one(rfq_no, yday, session)
+
+    monkeypatch.setattr(search, "search", crash_on_gsa)
+
+    with pytest.raises(Exception):
+        search.process_search(rfq_list, options)
+
+    monkeypatch.setattr(search, "search", search_one)
+    stub_server.stub.requests.clear()
+
+    assert expected == search.process_search(rfq_list, options)
+    # Only the unfinished solicitation is searched again
+    assert 1 == stub_server.stub.requests["/legal/bid-protests/search"]
+
+
+def test_injected_faults():
+    stub = gao_stub.GaoStub(error_rate=0.5, challenge_rate=0.5)
+
+    with gao_stub.GaoStubServer(stub) as server:
+        fetcher = gao_http.HttpFetcher()
+
+        for _ in range(4):
+            with pytest.raises(gao_http.BotChallenge):
+                fetcher.get(f"{server.url}/legal/bid-protests/search")
+
+
+def test_store_failed_post_reported_on_rerun(stub_server, tmp_path, monkeypatch):
+    from client.api.ms_api import MsApi
+    from client.rest import ApiException
+
+    options = search.RunOptions(
+        backend="http", rate_limit=0, store_path=str(tmp_path / "protests.db")
+    )
+    posts = []
+
+    def post(self, body):
+        posts.append(json.dumps(body))
+
+    def fail(self, body):
+        raise ApiException(status=503, reason="Service Unavailable")
+
+    # Seed the store, then list a protest filed after it
+    monkeypatch.setattr(MsApi, "teams_post", post)
+    search.main("W912DY-24-R-0001:Army RFQ", "https://example.com/webhook", options)
+    stub_server.stub.protests.append(
+        {
+            "b_number": "B-499999.1",
+            "company": "New Company",
+            "agency": "Department of the Army",
+            "solicitations": ["W912DY-24-R-0001"],
+            "case_type": "Bid Protest",
+            "status": "Case Currently Open",
+            "filed_days_ago": 3,
+            "due_in_days": 97,
+        }
+    )
+
+    monkeypatch.setattr(MsApi, "teams_post", fail)
+    with pytest.raises(ApiException):
+        search.main("W912DY-24-R-0001:Army RFQ", "https://example.com/webhook", options)
+
+    posts.clear()
+    monkeypatch.setattr(MsApi, "teams_post", post)
+    search.main("W912DY-24-R-0001:Army RFQ", "https://example.com/webhook", options)
+
+    assert 1 == len(posts)
+    assert "New Company" in posts[0]
+    assert "Test Company" not in posts[0]
@@ -0,0 +1,48 @@
+"""
+    Tests for journal.py
+"""
+
+from datetime import date
+
+import journal
+import records
+
+
+def test_journal_resume(tmp_path):
+    path = str(tmp_path / "run.journal")
+    days = [date(2024, 2, 2)]
+    details = [{"company": "Test Company", "status": "Sustained", "decided_dt": "Feb 2, 2024", "type": "Bid Protest"}]
+
+    with journal.Journal(path, days) as run:
+        run.record("123456789", (details, "https://example.com/1"), [{"b_number": "B-422681.5"}])
+        run.record("000000000", ([], "https://example.com/0"))
+
+    # A crash mid-write leaves a partial line
+    with open(path, "a") as f:
+        f.write('{"rfq_no": "987654321", "protest_')
+
+    with journal.Journal(path, days) as run:
+        assert [("555", "Other")] == run.pending(
+            [("123456789", "Test RFQ Name"), ("000000000", "Quiet"), ("555", "Other")]
+        )
+        run.record("555", (details, "https://example.com/5"))
+
+        assert [
+            ("123456789", "Test RFQ Name", "https://example.com/1"),
+            ("555", "Other", "https://example.com/5"),
+        ] == [
+            (result.rfq_no, result.rfq_nm, result.url)
+            for result in run.results(
+                [("123456789", "Test RFQ Name"), ("000000000", "Quiet"), ("555", "Other")]
+            )
+        ]
+        assert [records.Protest.from_dict(details[0])] == run.done["123456789"][0]
+        # Store snapshots wait in the journal until the run has posted
+        assert {"123456789": [{"b_number": "B-422681.5"}]} == run.snapshots
+
+    # A journal for other days starts over
+    with journal.Journal(path, [date(2024, 2, 3)]) as run:
+        assert {} == run.done
+
+    journal.remove_journal(path)
+    journal.remove_journal(path)
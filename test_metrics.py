@@ -0,0 +1,59 @@
+"""
+    Tests for metrics.py
+"""
+
+import pytest
+
+import metrics
+import search
+from client import timing
+
+
+def test_render():
+    counters = metrics.Counters()
+    counters.inc("rfqs_searched", 2)
+    counters.inc("protests_scanned", 7)
+    counters.inc("failures", stage="http")
+    counters.inc("failures", stage="http")
+
+    recorder = timing.Recorder()
+    recorder.spans = [
+        {"stage": "navigate", "seconds": 0.08},
+        {"stage": "navigate", "seconds": 3.0},
+        {"stage": "details", "seconds": 0.5},
+        {"stage": "run", "seconds": 4.25},
+    ]
+
+    lines = metrics.render(counters, recorder, True, 1700000000.5).splitlines()
+
+    assert "protest_alerts_rfqs_searched_total 2" in lines
+    assert "protest_alerts_protests_scanned_total 7" in lines
+    assert "protest_alerts_detail_pages_total 1" in lines
+    assert 'protest_alerts_failures_total{stage="http"} 2' in lines
+    assert 'protest_alerts_failures_total{stage="teams_post"} 0' in lines
+    assert "# TYPE protest_alerts_navigation_seconds histogram" in lines
+    assert 'protest_alerts_navigation_seconds_bucket{le="0.05"} 0' in lines
+    assert 'protest_alerts_navigation_seconds_bucket{le="0.1"} 1' in lines
+    assert 'protest_alerts_navigation_seconds_bucket{le="+Inf"} 2' in lines
+    assert "protest_alerts_navigation_seconds_count 2" in lines
+    assert "protest_alerts_teams_post_seconds_count 0" in lines
+    assert "protest_alerts_run_duration_seconds 4.25" in lines
+    assert "protest_alerts_last_run_success 1" in lines
+    assert "protest_alerts_last_run_timestamp_seconds 1700000000" in lines
+
+
+def test_main_writes_metrics_on_failure(mocker, tmp_path):
+    metrics_path = tmp_path / "protest_alerts.prom"
+    mocker.patch("search.process_search", side_effect=Exception("Received HTTP 503"))
+
+    with pytest.raises(Exception):
+        search.main(
+            "123456789:Test RFQ Name",
+            "https://www.example.com",
+            search.RunOptions(metrics_path=str(metrics_path)),
+        )
+
+    lines = metrics_path.read_text().splitlines()
+    assert 'protest_alerts_failures_total{stage="run"} 1' in lines
+    assert "protest_alerts_last_run_success 0" in lines
+    assert [metrics_path.name] == [path.name for path in tmp_path.iterdir()]
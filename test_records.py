@@ -0,0 +1,17 @@
+"""
+    Tests for records.py
+"""
+
+import records
+
+
+def test_records_round_trip():
+    decided = {"company": "A", "status": "Denied", "decided_dt": "Feb 3, 2024", "decision_url": "/products/b-1", "type": "Bid Protest"}
+    result = records.as_result(
+        {"rfq_no": "1", "rfq_nm": "One", "protest_details": [decided], "url": "u1"}
+    )
+
+    assert records.Protest("A", "Denied", "Bid Protest", "Feb 3, 2024", "/products/b-1") == result.protest_details[0]
+    assert decided == result.protest_details[0].to_dict()
+    assert result == records.RfqResult.from_dict(result.to_dict())
+    assert not hasattr(result.protest_details[0], "__dict__")
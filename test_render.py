@@ -0,0 +1,101 @@
+"""
+    Tests for render.py
+"""
+
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+
+import render
+import search
+from records import Protest, RfqResult
+
+
+@pytest.fixture
+def sections():
+    return [
+        (
+            date(2024, 2, 2),
+            [
+                RfqResult(
+                    "123456789",
+                    "Test RFQ Name",
+                    [
+                        Protest(
+                            "Test Company",
+                            "Sustained",
+                            "Bid Protest",
+                            decided_dt="Feb 2, 2024",
+                            decision_url="/products/b-422681.5",
+                        ),
+                        Protest(
+                            "Test Company2",
+                            "Opened",
+                            "Bid Protest",
+                            filed_dt="Feb 2, 2024",
+                            due_dt="May 2, 2024",
+                        ),
+                    ],
+                    "https://example.com",
+                    1,
+                ),
+            ],
+        ),
+    ]
+
+
+def test_result_text(sections):
+    assert (
+        "**1. Test RFQ Name** - 123456789 - [View on GAO](https://example.com)\n\n"
+        "- Test Company **|** Bid Protest Sustained **|** Decided Feb 2, 2024 **|** "
+        "[View decision](https://www.gao.gov/products/b-422681.5)\n\n"
+        "- Test Company2 **|** Bid Protest Opened **|** Filed Feb 2, 2024 **|** Due May 2, 2024"
+    ) == render.result_text(sections[0][1][0])
+
+
+def test_card_write_matches_format_results(sections):
+    out = io.StringIO()
+    render.AdaptiveCardRenderer().write(out, sections)
+
+    day, results = sections[0]
+    assert search.format_results(results, day) == json.loads(out.getvalue())
+
+
+def test_markdown(sections):
+    out = io.StringIO()
+    render.MarkdownRenderer().write(out, sections)
+
+    text = out.getvalue()
+    assert text.startswith("**Friday, 02/02/2024.** Protest updates.\n\n**1. Test RFQ Name**")
+    assert text.endswith("Due May 2, 2024\n\n")
+
+
+def test_jsonl_round_trip(sections):
+    out = io.StringIO()
+    render.JsonLinesRenderer().write(out, sections)
+
+    entries = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert ["2024-02-02"] == [entry["day"] for entry in entries]
+    assert sections[0][1] == [RfqResult.from_dict(entry) for entry in entries]
+
+
+def test_csv_row_per_protest(tmp_path, sections):
+    path = tmp_path / "results.csv"
+    render.write_path(str(path), "csv", iter(sections))
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert ["Test Company", "Test Company2"] == [row["company"] for row in rows]
+    assert ["", "May 2, 2024"] == [row["due_dt"] for row in rows]
+    assert {"2024-02-02"} == {row["day"] for row in rows}
+
+
+def test_empty_card_is_valid_json():
+    out = io.StringIO()
+    render.AdaptiveCardRenderer().write(out, [])
+
+    assert [] == json.loads(out.getvalue())
@@ -2,12 +2,21 @@
     Tests for search.py 
 """
 
-from datetime import date
+import asyncio
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
 
 import pytest
 
 import client
 import search
+from client import timing
 
 
 @pytest.fixture
@@ -157,7 +166,7 @@ def test_process_search_zero(mocker):
     assert [] == search.process_search(rfq_list)
 
 
-def test_teams_post(mocker):
+def test_teams_post(mocker, api_client):
     items = [
         {
             "type": "TextBlock",
@@ -208,3 +217,613 @@ def test_teams_post(mocker):
     mock_teams_post = mocker.patch("search.client.MsApi.teams_post")
     search.teams_post(api_client, items)
     mock_teams_post.assert_called_once_with(body=body)
+
+
+def test_browser_session_closes_on_error(mocker):
+    mock_playwright = mocker.patch("search.sync_playwright").return_value.start.return_value
+    browser = mock_playwright.chromium.launch.return_value
+
+    with pytest.raises(RuntimeError):
+        with search.BrowserSession() as session:
+            session.new_context()
+            session.new_context()
+            raise RuntimeError("search failed")
+
+    mock_playwright.chromium.launch.assert_called_once()
+    assert browser.new_context.call_count == 2
+    browser.close.assert_called_once()
+    mock_playwright.stop.assert_called_once()
+
+
+def test_search_closes_context(mocker):
+    session = mocker.Mock(http=None)
+    context = session.new_context.return_value
+    mocker.patch("search.scrape_results", side_effect=Exception("Received HTTP 503"))
+
+    with pytest.raises(Exception):
+        search.search("123456789", "Feb 2, 2024", session)
+
+    context.close.assert_called_once()
+
+
+def test_process_search_concurrent_order(mocker):
+    rfq_list = "111:First RFQ,222:Second RFQ,333:Third RFQ"
+    delays = {"111": 0.03, "222": 0, "333": 0.01}
+
+    async def fake_search_async(rfq_no, yday, session, limit):
+        async with limit:
+            await asyncio.sleep(delays[rfq_no])
+
+        protest_details = [] if rfq_no == "222" else [
+            {
+                "company": f"Company {rfq_no}",
+                "status": "Opened",
+                "type": "Bid Protest",
+                "filed_dt": "Feb 2, 2024",
+                "due_dt": "May 2, 2024",
+            }
+        ]
+        return protest_details, f"https://example.com/{rfq_no}"
+
+    mocker.patch("search.search_async", side_effect=fake_search_async)
+    items = search.process_search(rfq_list, search.RunOptions(concurrency=3))
+
+    assert items[2]["text"].startswith(
+        "**1. First RFQ** - 111 - [View on GAO](https://example.com/111)"
+    )
+    assert items[4]["text"].startswith(
+        "**2. Third RFQ** - 333 - [View on GAO](https://example.com/333)"
+    )
+    assert len(items) == 6
+
+
+def test_parse_args():
+    rfq_list, ms_webhook_url, options = search.parse_args(
+        ["123456789:Test RFQ Name", "https://www.example.com", "--concurrency", "4"]
+    )
+
+    assert rfq_list == "123456789:Test RFQ Name"
+    assert ms_webhook_url == "https://www.example.com"
+    assert options.concurrency == 4
+    assert not options.stream
+
+
+@pytest.fixture
+def teaser_rows():
+    return [
+        {
+            "heading": "Test Company (B-422681.5)",
+            "outcome": "Sustained",
+            "status": None,
+            "decision_date": "Feb 2, 2024",
+            "decision_link": "/products/b-422681.5",
+            "details_href": "/products/b-422681.5",
+        },
+        {
+            "heading": "Old Company (B-400000.1)",
+            "outcome": "Denied",
+            "status": None,
+            "decision_date": "Jan 5, 2023",
+            "decision_link": None,
+            "details_href": "/products/b-400000.1",
+        },
+        {
+            "heading": "Test Company2 (B-422999.1)",
+            "outcome": None,
+            "status": "Case Currently Open",
+            "decision_date": None,
+            "decision_link": None,
+            "details_href": "/products/b-422999.1",
+        },
+    ]
+
+
+def test_scrape_results(mocker, teaser_rows):
+    details = {
+        "/products/b-422681.5": {"type": "Bid Protest", "filed_dt": "Oct 1, 2023", "due_dt": "Jan 9, 2024"},
+        "/products/b-422999.1": {"type": "Bid Protest", "filed_dt": "Feb 2, 2024", "due_dt": "May 2, 2024"},
+    }
+    context = mocker.Mock()
+    page = context.new_page.return_value
+    page.goto.return_value.status = 200
+    page.evaluate.side_effect = [
+        {"rows": teaser_rows[:2], "next": "https://example.com?page=1"},
+        {"rows": teaser_rows[2:], "next": None},
+    ]
+    details_pool = mocker.Mock()
+    details_pool.fetch.side_effect = lambda details_href: details[details_href]
+
+    assert [
+        {
+            "company": "Test Company",
+            "status": "Sustained",
+            "decided_dt": "Feb 2, 2024",
+            "decision_url": "/products/b-422681.5",
+            "type": "Bid Protest",
+        },
+        {
+            "company": "Test Company2",
+            "status": "Opened",
+            "type": "Bid Protest",
+            "filed_dt": "Feb 2, 2024",
+            "due_dt": "May 2, 2024",
+        },
+    ] == [
+        protest.to_dict()
+        for protest in search.scrape_results(context, "https://example.com", "Feb 2, 2024", details_pool)
+    ]
+    assert [
+        mocker.call("https://example.com"),
+        mocker.call("https://example.com?page=1"),
+    ] == page.goto.call_args_list
+    assert [
+        mocker.call(search.EXTRACT_PAGE_JS),
+        mocker.call(search.EXTRACT_PAGE_JS),
+    ] == page.evaluate.call_args_list
+    assert [
+        mocker.call("/products/b-422681.5"),
+        mocker.call("/products/b-422999.1"),
+    ] == details_pool.fetch.call_args_list
+
+
+def test_details_pool_reuse_and_recycle(mocker):
+    context = mocker.Mock()
+    context.new_page.side_effect = lambda: mocker.Mock()
+    details_pool = search.DetailsPool(context, size=1, max_uses=2)
+
+    for n in range(5):
+        details_pool.fetch(f"/products/b-{n}")
+
+    assert {"opened": 3, "reused": 2, "recycled": 2} == details_pool.stats()
+    details_pool.close()
+    assert details_pool._idle == []
+
+
+def test_search_http_fallback(mocker):
+    session = mocker.Mock()
+    session.diff.return_value = None
+    mocker.patch("search.scrape_http", side_effect=search.BotChallenge("Received HTTP 403"))
+    scrape_results = mocker.patch("search.scrape_results", return_value=[])
+
+    assert ([], search.search_url("123456789")) == search.search(
+        "123456789", "Feb 2, 2024", session
+    )
+    scrape_results.assert_called_once()
+
+
+def test_resource_blocker(mocker):
+    blocker = search.ResourceBlocker(
+        search.RunOptions(block_allowlist=("fonts.example.com",))
+    )
+
+    assert blocker.should_block("https://www.gao.gov/legal/bid-protests/search", "document") is None
+    assert blocker.should_block("https://www.gao.gov/core/misc/drupal.js", "script") is None
+    assert blocker.should_block("https://www.gao.gov/logo.png", "image") == "image"
+    assert blocker.should_block("https://www.gao.gov/theme.css", "stylesheet") is None
+    assert blocker.should_block("https://www.googletagmanager.com/gtm.js", "script") == "tracker"
+    assert blocker.should_block("https://cdn.example.com/widget.js", "script") == "third-party script"
+    assert blocker.should_block("https://fonts.example.com/a.woff2", "font") is None
+
+    route = mocker.Mock()
+    route.request.url = "https://www.gao.gov/logo.png"
+    route.request.resource_type = "image"
+    blocker.handle(route)
+    route.abort.assert_called_once()
+
+    route = mocker.Mock()
+    route.request.url = "https://www.gao.gov/products/b-422681.5"
+    route.request.resource_type = "document"
+    blocker.handle(route)
+    route.continue_.assert_called_once()
+    blocker.on_response(mocker.Mock(headers={"content-length": "2048"}))
+
+    assert {
+        "blocked": 1,
+        "blocked_by_reason": {"image": 1},
+        "allowed": 1,
+        "loaded_bytes": 2048,
+    } == blocker.stats()
+
+    blocker = search.ResourceBlocker(search.RunOptions(block_types=("stylesheet",)))
+    assert blocker.should_block("https://www.gao.gov/theme.css", "stylesheet") == "stylesheet"
+
+
+def test_feed_search(mocker, teaser_rows):
+    details = {
+        "/products/b-422681.5": {"type": "Bid Protest", "filed_dt": "Oct 1, 2023", "due_dt": "Jan 9, 2024", "solicitations": ["W912-24-R-0001"]},
+        "/products/b-422999.1": {"type": "Bid Protest", "filed_dt": "Feb 2, 2024", "due_dt": "May 2, 2024", "solicitations": ["999"]},
+    }
+    session = mocker.Mock(store=None)
+    session.http.page.side_effect = lambda url: (
+        (teaser_rows, f"{url}&page=1") if "page=1" not in url else (teaser_rows[:1], None)
+    )
+    session.http.details.side_effect = lambda url: details[url.removeprefix(search.GAO_URL)]
+
+    searches = search.feed_search(
+        [("w91224r0001", "Test RFQ Name"), ("123", "Unmatched RFQ")],
+        date(2024, 2, 2),
+        "Feb 2, 2024",
+        session,
+    )
+
+    assert [
+        (
+            [
+                {
+                    "company": "Test Company",
+                    "status": "Sustained",
+                    "decided_dt": "Feb 2, 2024",
+                    "decision_url": "/products/b-422681.5",
+                    "type": "Bid Protest",
+                }
+            ],
+            search.search_url("w91224r0001"),
+        ),
+        ([], search.search_url("123")),
+    ] == [([protest.to_dict() for protest in found], url) for found, url in searches]
+    # Two date feeds of two pages each, details fetched once per listed protest
+    assert session.http.page.call_count == 4
+    assert session.http.details.call_count == 2
+    session.new_context.assert_not_called()
+
+
+def test_iter_rows_lazy():
+    pages = {
+        "p0": ([{"details_href": "/a"}, {"details_href": "/b"}], "p1"),
+        "p1": ([{"details_href": "/c"}], "p2"),
+        "p2": ([{"details_href": "/d"}], "p0"),
+    }
+    requested = []
+
+    def read_page(url):
+        requested.append(url)
+        return pages[url]
+
+    rows = search.iter_rows(read_page, "p0")
+    assert ["/a", "/b", "/c"] == [next(rows)["details_href"] for _ in range(3)]
+    assert ["p0", "p1"] == requested
+
+    # Pager loop back to a visited page ends the iteration
+    assert ["/d"] == [row["details_href"] for row in rows]
+    assert ["p0", "p1", "p2"] == requested
+
+
+def test_collect_protests_store(tmp_path, teaser_rows):
+    details = {
+        "/products/b-422681.5": {"type": "Bid Protest", "filed_dt": "Oct 1, 2023", "due_dt": "Jan 9, 2024"},
+        "/products/b-400000.1": {"type": "Bid Protest", "filed_dt": "Jul 1, 2022", "due_dt": "Oct 9, 2022"},
+        "/products/b-422999.1": {"type": "Bid Protest", "filed_dt": "Feb 2, 2024", "due_dt": "May 2, 2024"},
+    }
+    fetched = []
+
+    def fetch_details(details_href):
+        fetched.append(details_href)
+        return details[details_href]
+
+    with search.ProtestStore(str(tmp_path / "protests.db")) as protest_store:
+        # First run seeds the store and reports by date as usual
+        diff = protest_store.diff("123456789")
+        protest_details = search.collect_protests([teaser_rows], "Feb 2, 2024", fetch_details, diff)
+        diff.commit()
+        assert ["Test Company", "Test Company2"] == [p.company for p in protest_details]
+        assert ["/products/b-422681.5", "/products/b-422999.1"] == fetched
+
+        # Unchanged rows are skipped without visiting details pages
+        fetched.clear()
+        diff = protest_store.diff("123456789")
+        assert [] == search.collect_protests([teaser_rows], "Feb 3, 2024", fetch_details, diff)
+        assert [] == fetched
+
+        # Backdated decision report is reported whatever its date
+        teaser_rows[1]["decision_link"] = "/products/b-400000.1"
+        diff = protest_store.diff("123456789")
+        protest_details = search.collect_protests([teaser_rows], "Feb 3, 2024", fetch_details, diff)
+        diff.commit()
+
+    assert [
+        {
+            "company": "Old Company",
+            "status": "Denied",
+            "decided_dt": "Jan 5, 2023",
+            "decision_url": "/products/b-400000.1",
+            "type": "Bid Protest",
+        }
+    ] == [protest.to_dict() for protest in protest_details]
+    assert ["/products/b-400000.1"] == fetched
+
+
+def test_timing_spans_carry_labels():
+    recorder = timing.Recorder()
+
+    async def run(rfq_no):
+        with timing.labels(rfq=rfq_no), recorder.span("search"):
+            with recorder.span("details", protest="/products/b-1"):
+                await asyncio.sleep(0)
+
+    async def run_all():
+        await asyncio.gather(run("123456789"), run("098765432"))
+
+    asyncio.run(run_all())
+
+    assert {("details", "123456789"), ("details", "098765432")} == {
+        (record["stage"], record["rfq"])
+        for record in recorder.spans
+        if "protest" in record
+    }
+    assert 2 == recorder.summary()["search"]["count"]
+    assert 2 == timing.percentile([1, 2, 3, 4], 50)
+    assert 3 == timing.percentile([1, 2, 3, 4, 5], 50)
+    assert 5 == timing.percentile(list(range(1, 10)), 50)
+    assert 9 == timing.percentile(list(range(1, 10)), 95)
+
+
+def test_main_writes_run_report(mocker, tmp_path, caplog):
+    caplog.set_level(logging.INFO, logger="search")
+    log_file = tmp_path / "run.log"
+    mocker.patch("search.process_search", return_value=[])
+
+    search.main(
+        "123456789:Test RFQ Name",
+        "https://www.example.com",
+        search.RunOptions(log_file=str(log_file)),
+    )
+
+    report = json.loads((tmp_path / "run.report.json").read_text())
+    assert ["run"] == list(report["stages"])
+    assert 1 == report["stages"]["run"]["count"]
+    assert "Start processing" in log_file.read_text()
+
+
+def test_run_days_since_last_run(tmp_path, mocker):
+    state = str(tmp_path / "last_run.json")
+    mocker.patch("search.datetime").now.return_value = datetime(2024, 2, 6, 7, 0)
+
+    assert [date(2024, 2, 5)] == search.run_days(search.RunOptions(since_last_run=state))
+
+    search.write_last_run(state, date(2024, 2, 2))
+    assert [date(2024, 2, 3), date(2024, 2, 4), date(2024, 2, 5)] == search.run_days(
+        search.RunOptions(since_last_run=state)
+    )
+
+    search.write_last_run(state, date(2024, 2, 5))
+    assert [] == search.run_days(search.RunOptions(since_last_run=state))
+
+
+def test_group_by_day():
+    decided = {"company": "A", "status": "Denied", "decided_dt": "Feb 3, 2024", "type": "Bid Protest"}
+    filed = {"company": "B", "status": "Opened", "type": "Bid Protest", "filed_dt": "Feb 5, 2024", "due_dt": "May 5, 2024"}
+    backdated = dict(decided, company="C", decided_dt="Jan 9, 2024")
+    raw_results = [
+        {"rfq_no": "1", "rfq_nm": "One", "protest_details": [decided, filed], "url": "u1"},
+        {"rfq_no": "2", "rfq_nm": "Two", "protest_details": [backdated], "url": "u2"},
+    ]
+
+    grouped = search.group_by_day(
+        raw_results, [date(2024, 2, 3), date(2024, 2, 4), date(2024, 2, 5)]
+    )
+
+    assert [
+        (date(2024, 2, 3), [("1", 1, ["A"])]),
+        (date(2024, 2, 5), [("1", 1, ["B"]), ("2", 2, ["C"])]),
+    ] == [
+        (
+            day,
+            [
+                (r.rfq_no, r.index, [d.company for d in r.protest_details])
+                for r in results
+            ],
+        )
+        for day, results in grouped
+    ]
+
+
+def test_shard_pairs_stable():
+    rfq_pairs = [(f"W912DY-24-R-{n:04d}", f"RFQ {n}") for n in range(40)]
+    shards = [search.shard_pairs(rfq_pairs, i, 4) for i in (1, 2, 3, 4)]
+
+    assert sorted(rfq_pairs) == sorted(pair for shard in shards for pair in shard)
+    assert all(shards)
+    # Hashing ignores case and punctuation, and not Python's per-process hash seed
+    assert search.shard_of("W912DY-24-R-0007", 4) == search.shard_of("w912dy24r0007", 4)
+    assert 2 == search.shard_of("W912DY-24-R-0007", 4)
+    assert (2, 4) == search.parse_shard("2/4")
+
+    with pytest.raises(search.argparse.ArgumentTypeError):
+        search.parse_shard("5/4")
+
+
+def test_worker_pairs_split_a_shard():
+    rfq_pairs = [(f"W912DY-24-R-{n:04d}", f"RFQ {n}") for n in range(200)]
+
+    for (index, count), workers in (((1, 2), 2), ((1, 3), 3), ((1, 2), 4)):
+        shard = search.shard_pairs(rfq_pairs, index, count)
+        split = search.worker_pairs(shard, workers)
+
+        assert sorted(shard) == sorted(pair for pairs in split for pair in pairs)
+        assert all(split)
+        assert max(map(len, split)) - min(map(len, split)) <= 1
+
+
+def test_main_stream_posts_in_completion_order(mocker):
+    rfq_list = "111:First RFQ,222:Second RFQ,333:Third RFQ,444:Fourth RFQ"
+    delays = {"111": 0.06, "222": 0, "333": 0.02, "444": 0.04}
+
+    async def fake_search_async(rfq_no, yday, session, limit):
+        async with limit:
+            await asyncio.sleep(delays[rfq_no])
+
+        protest_details = [] if rfq_no == "222" else [
+            {
+                "company": f"Company {rfq_no}",
+                "status": "Opened",
+                "type": "Bid Protest",
+                "filed_dt": "Feb 2, 2024",
+                "due_dt": "May 2, 2024",
+            }
+        ]
+        return protest_details, f"https://example.com/{rfq_no}"
+
+    mocker.patch("search.search_async", side_effect=fake_search_async)
+    teams_post = mocker.patch("search.teams_post")
+
+    search.main(
+        rfq_list,
+        "https://www.example.com",
+        search.RunOptions(concurrency=4, stream=True, batch_size=2, batch_seconds=60),
+    )
+
+    posts = [call.args[1] for call in teams_post.call_args_list]
+    assert 2 == len(posts)
+    assert posts[0][2]["text"].startswith("**1. Third RFQ** - 333")
+    assert posts[0][4]["text"].startswith("**2. Fourth RFQ** - 444")
+    assert posts[1][2]["text"].startswith("**3. First RFQ** - 111")
+    assert 4 == len(posts[1])
+
+
+def test_teams_sink_posts_partial_batch_after_max_seconds(mocker, api_client):
+    teams_post = mocker.patch("search.teams_post")
+    posted = []
+    result = search.RfqResult(
+        "111",
+        "First RFQ",
+        [search.Protest("Company 111", "Opened", filed_dt="Feb 2, 2024")],
+        "https://example.com/111",
+    )
+
+    with search.TeamsSink(
+        api_client, [date(2024, 2, 2)], 10, 0.01, posted.extend
+    ) as sink:
+        sink.add(search.RfqResult("222", "Second RFQ", [], "https://example.com/222"))
+        sink.add(result)
+
+        for _ in range(100):
+            if teams_post.called:
+                break
+
+            time.sleep(0.01)
+
+        assert 1 == teams_post.call_count
+        assert 1 == sink.batches
+
+    assert ["222", "111"] == [result.rfq_no for result in posted]
+    assert 1 == teams_post.call_count
+
+
+def test_teams_sink_add_does_not_wait_for_post(mocker, api_client):
+    release = threading.Event()
+    teams_post = mocker.patch("search.teams_post", side_effect=lambda *args: release.wait(5))
+    result = search.RfqResult(
+        "111",
+        "First RFQ",
+        [search.Protest("Company 111", "Opened", filed_dt="Feb 2, 2024")],
+        "https://example.com/111",
+    )
+
+    with search.TeamsSink(api_client, [date(2024, 2, 2)], 1, 60) as sink:
+        started = time.monotonic()
+        sink.add(result)
+        sink.add(search.RfqResult("222", "Second RFQ", result.protest_details, "https://example.com/222"))
+
+        # Both batches are queued while the first post is still in flight
+        assert time.monotonic() - started < 1
+        assert 0 == sink.posted
+        release.set()
+
+    assert 2 == sink.posted
+    assert 2 == teams_post.call_count
+
+
+def test_format_run_numbers_backfill_from_first():
+    result = search.RfqResult(
+        "111",
+        "First RFQ",
+        [search.Protest("Company 111", "Opened", filed_dt="Feb 2, 2024")],
+        "https://example.com/111",
+    )
+
+    items = search.format_run([result], [date(2024, 2, 1), date(2024, 2, 2)], 6)
+
+    assert items[2]["text"].startswith("**6. First RFQ**")
+
+
+def test_import_defers_playwright_and_rest_client():
+    code = (
+        "import sys, search; "
+        "print([m for m in ('playwright', 'client.api_client', 'client.rest') if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert "[]" == result.stdout.strip()
+
+
+def test_api_client_pool_created_on_first_use(api_client):
+    assert api_client._pool is None
+    assert api_client.pool is api_client.pool
+    api_client.__del__()
+    assert api_client._pool is None
+
+
+def test_teams_post_sends_compact_json_bytes(mocker, api_client):
+    request = mocker.patch.object(api_client.rest_client.pool_manager, "request")
+    request.return_value.status = 200
+    request.return_value.data = b"1"
+
+    search.teams_post(api_client, [search.build_textblock("Protest – update")])
+
+    body = request.call_args.kwargs["body"]
+    assert isinstance(body, bytes)
+    assert b'"items":[{"type":"TextBlock","text":"Protest \xe2\x80\x93 update"' in body
+
+
+def test_api_client_json_encoder(api_client):
+    assert b'{"day":"2024-02-02","rows":[1,2]}' == api_client.encode_json(
+        {"day": date(2024, 2, 2), "rows": [1, 2]}
+    )
+
+    api_client.configuration.json_encoder = lambda obj, default: b"encoded"
+    assert b"encoded" == api_client.encode_json({"day": date(2024, 2, 2)})
+
+
+def test_async_ms_api_posts_without_blocking():
+    pytest.importorskip("aiohttp")
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from threading import Thread
+
+    bodies = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            bodies.append(self.rfile.read(int(self.headers["Content-Length"])))
+            self.send_response(200)
+            self.send_header("Content-Length", "1")
+            self.end_headers()
+            self.wfile.write(b"1")
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    api_config = client.Configuration()
+    api_config.host = "http://127.0.0.1:%d" % httpd.server_address[1]
+
+    async def post_all():
+        async with client.AsyncApiClient(api_config) as api_client:
+            api = client.AsyncMsApi(api_client)
+            await asyncio.gather(
+                *(api.teams_post(body={"n": n}, _request_timeout=5) for n in range(3))
+            )
+
+    try:
+        asyncio.run(post_all())
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert sorted(bodies) == [b'{"n":0}', b'{"n":1}', b'{"n":2}']
@@ -0,0 +1,48 @@
+"""
+    Tests for store.py
+"""
+
+import pytest
+
+import store
+
+
+@pytest.fixture
+def row():
+    return {
+        "heading": "Test Company (B-422681.5)",
+        "outcome": "Sustained",
+        "status": None,
+        "decision_date": "Feb 2, 2024",
+        "decision_link": None,
+        "details_href": "/products/b-422681.5",
+    }
+
+
+def test_b_number(row):
+    assert "B-422681.5" == store.b_number(row)
+    assert "B-422681.5" == store.b_number(dict(row, heading="Test Company"))
+
+
+def test_snapshot_diff(tmp_path, row):
+    with store.ProtestStore(str(tmp_path / "protests.db")) as protest_store:
+        diff = protest_store.diff("123456789")
+        assert diff.seeding
+        assert not diff.unchanged(row)
+
+        diff.record(row, {"type": "Bid Protest"})
+        diff.commit()
+
+        diff = protest_store.diff("123456789")
+        assert not diff.seeding
+        assert diff.unchanged(row)
+        assert not diff.unchanged(dict(row, decision_link="/products/b-422681.5"))
+
+        # Row-only snapshots keep details recorded earlier
+        diff.record(dict(row, decision_link="/products/b-422681.5"))
+        diff.commit()
+        snapshot = protest_store.get("B-422681.5")
+
+    assert "Bid Protest" == snapshot["type"]
+    assert "/products/b-422681.5" == snapshot["decision_url"]
+    assert "Sustained" == snapshot["status"]
@@ -0,0 +1,84 @@
+"""
+    Tests for throttle.py
+"""
+
+import asyncio
+
+import pytest
+
+import throttle
+
+
+def test_token_bucket(mocker):
+    now = mocker.patch("throttle.time.monotonic", return_value=100.0)
+    bucket = throttle.TokenBucket(rate=10, burst=2)
+
+    assert [0.0, 0.0, 0.1, 0.2] == [round(bucket.reserve(), 6) for _ in range(4)]
+
+    now.return_value = 101.0
+    assert 0.0 == bucket.reserve()
+
+
+def test_aimd_limit(mocker):
+    now = mocker.patch("throttle.time.monotonic", return_value=100.0)
+    limit = throttle.AimdLimit(max_limit=4, target_latency=1.0, cooldown=5.0)
+
+    for _ in range(1 + 2 + 3 + 4):
+        limit.acquire()
+        limit.release(0.2, True)
+
+    assert 4 == limit.limit
+
+    # One burst of failures halves once, slow responses hold
+    for _ in range(2):
+        limit.acquire()
+        limit.release(0.2, False)
+
+    assert 2 == limit.limit
+
+    limit.acquire()
+    limit.release(3.0, True)
+    assert 2 == limit.limit
+
+    now.return_value = 106.0
+    limit.acquire()
+    limit.release(0.2, False)
+    assert 1 == limit.limit
+    assert 0 == limit.in_flight
+
+
+def test_navigation_outcomes():
+    nav_throttle = throttle.Throttle(max_concurrency=2)
+    nav_throttle.limit.limit = 2
+
+    with nav_throttle.navigation() as nav:
+        nav.status = 429
+
+    assert 1 == nav_throttle.limit.limit
+
+    with pytest.raises(RuntimeError):
+        with nav_throttle.navigation():
+            raise RuntimeError("timeout")
+
+    assert 1 == nav_throttle.limit.backoffs
+    assert 0 == nav_throttle.limit.in_flight
+
+
+def test_anavigation_waits_for_slot():
+    nav_throttle = throttle.Throttle(max_concurrency=1)
+    active = []
+    peak = []
+
+    async def navigate():
+        async with nav_throttle.anavigation():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+    async def run_all():
+        await asyncio.gather(*(navigate() for _ in range(3)))
+
+    asyncio.run(run_all())
+
+    assert [1, 1, 1] == peak
@@ -0,0 +1,243 @@
+"""
+    Process-wide politeness for gao.gov: a token bucket every GAO
+    navigation draws from, and an AIMD limit on navigations in flight
+    that grows while GAO answers quickly and halves when it pushes back.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from client import timing
+
+
+log = logging.getLogger("search")
+
+# Seconds between slot checks for asyncio callers
+POLL_INTERVAL = 0.02
+
+
+class TokenBucket:
+    """Token bucket shared by threads and asyncio tasks.
+
+    reserve() claims the next token and returns how long the caller must
+    wait for it, so sync callers sleep and async callers await without
+    holding a lock, and callers are served in reservation order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        # Claim a token, returning seconds until it is available
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            return max(-self._tokens / self.rate, 0.0)
+
+
+class AimdLimit:
+    """Additive increase, multiplicative decrease cap on navigations in flight.
+
+    The cap grows by one after a window of as many consecutive healthy
+    navigations (status 200 within target_latency) as the current cap,
+    and halves on an error or non-200 response, at most once per cooldown
+    so one burst of failures backs off once.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        target_latency: float = 5.0,
+        cooldown: float = 5.0,
+    ) -> None:
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = max(min(min_limit, self.max_limit), 1)
+        self.limit = self.min_limit
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.backoffs = 0
+        self._healthy = 0
+        self._backed_off = None
+        self._cond = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                return True
+
+            return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+
+            self.in_flight += 1
+
+    async def acquire_async(self) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def abandon(self) -> None:
+        # Free a slot without a navigation outcome
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def release(self, latency: float, ok: bool) -> None:
+        # Free a slot and adapt the cap to the navigation outcome
+        with self._cond:
+            self.in_flight -= 1
+
+            if not ok:
+                self._healthy = 0
+                now = time.monotonic()
+
+                if self._backed_off is None or now - self._backed_off >= self.cooldown:
+                    self._backed_off = now
+                    self.backoffs += 1
+                    self.limit = max(self.limit // 2, self.min_limit)
+                    log.warning(f"GAO pushed back, navigation concurrency now {self.limit}")
+
+            elif latency <= self.target_latency:
+                self._healthy += 1
+
+                if self._healthy >= self.limit and self.limit < self.max_limit:
+                    self._healthy = 0
+                    self.limit += 1
+                    log.info(f"Navigation concurrency now {self.limit}")
+
+            else:
+                self._healthy = 0
+
+            self._cond.notify_all()
+
+
+class Navigation:
+    """Outcome of one throttled navigation, set by the caller."""
+
+    __slots__ = ("status",)
+
+    def __init__(self) -> None:
+        self.status = 200
+
+
+class Throttle:
+    """Token bucket and AIMD limit every GAO navigation goes through.
+
+    A rate of 0 disables the bucket and a max_concurrency of 0 the limit.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 1,
+        max_concurrency: int = 0,
+        target_latency: float = 5.0,
+    ) -> None:
+        self.bucket = TokenBucket(rate, burst)
+        self.limit = None
+
+        if max_concurrency > 0:
+            self.limit = AimdLimit(max_concurrency, target_latency=target_latency)
+
+    def _abandon(self) -> None:
+        if self.limit is not None:
+            self.limit.abandon()
+
+    def _release(self, start: float, nav: Navigation, failed: bool) -> None:
+        if self.limit is not None:
+            self.limit.release(
+                time.perf_counter() - start, not failed and nav.status == 200
+            )
+
+    @contextmanager
+    def navigation(self):
+        # Wait for a slot and a token; a raise or non-200 status backs off
+        with timing.span("throttle"):
+            if self.limit is not None:
+                self.limit.acquire()
+
+            try:
+                time.sleep(self.bucket.reserve())
+            except BaseException:
+                self._abandon()
+                raise
+
+        nav = Navigation()
+        start = time.perf_counter()
+        failed = True
+
+        try:
+            yield nav
+            failed = False
+        finally:
+            self._release(start, nav, failed)
+
+    @asynccontextmanager
+    async def anavigation(self):
+        # Async counterpart of navigation
+        with timing.span("throttle"):
+            if self.limit is not None:
+                await self.limit.acquire_async()
+
+            try:
+                await asyncio.sleep(self.bucket.reserve())
+            except BaseException:
+                self._abandon()
+                raise
+
+        nav = Navigation()
+        start = time.perf_counter()
+        failed = True
+
+        try:
+            yield nav
+            failed = False
+        finally:
+            self._release(start, nav, failed)
+
+
+# Unthrottled outside a configured run, see search.process_search
+throttle = Throttle()
+
+
+@contextmanager
+def configured(
+    rate: float, burst: int, max_concurrency: int, target_latency: float
+):
+    # Throttle every navigation in the enclosed run, process-wide
+    global throttle
+    previous = throttle
+    throttle = Throttle(rate, burst, max_concurrency, target_latency)
+
+    try:
+        yield throttle
+    finally:
+        throttle = previous
+
+
+def navigation():
+    return throttle.navigation()
+
+
+def anavigation():
+    return throttle.anavigation()